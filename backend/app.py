@@ -3,11 +3,11 @@ import os
 load_dotenv()
 
 from flask import Flask
-from database import Base, engine
-from routes import auth_bp, board_bp, list_bp, card_bp, label_bp, comment_bp
+from database import Base, engine, init_db_session
+from routes import auth_bp, board_bp, list_bp, card_bp, label_bp, comment_bp, metrics_bp
 from config import Config
 from flask import jsonify
-from utils import init_cache, logger, limiter, socketio
+from utils import init_cache, init_admission, init_db_pools, init_json_provider, logger, limiter, socketio
 from flask_cors import CORS
 
 
@@ -20,15 +20,22 @@ def create_app():
     # Initialize CORS before SocketIO
     CORS(app, resources={r"/*": {"origins": "*"}})
     
+    init_json_provider(app)
     init_cache(app)
+    init_db_session(app)
+    init_admission(app)
+    init_db_pools(app)
     limiter.init_app(app)
     
     # Initialize SocketIO after CORS
     # In production, Gunicorn with eventlet worker handles async_mode automatically
+    # With a message queue, events emitted by any worker reach clients on all of them
     socketio.init_app(
         app, 
         cors_allowed_origins="*",
         async_mode='eventlet',  # Explicitly set for production
+        message_queue=Config.SOCKETIO_MESSAGE_QUEUE or None,
+        compression_threshold=Config.SOCKETIO_COMPRESSION_THRESHOLD,
         engineio_logger=False,
         logger=False
     )
@@ -40,6 +47,7 @@ def create_app():
     app.register_blueprint(card_bp, url_prefix='/api')
     app.register_blueprint(label_bp, url_prefix='/api')
     app.register_blueprint(comment_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp, url_prefix='/api')
 
     @app.errorhandler(Exception)
     def handle_general_error(err):
@@ -3,6 +3,19 @@ from dotenv import load_dotenv
 load_dotenv() 
 
 
+def _pool_settings(name, default):
+    """Read "pool_size,max_overflow,pool_timeout" from DB_POOL_<NAME>."""
+    size, overflow, timeout = (int(value) for value in os.getenv(f"DB_POOL_{name}", default).split(","))
+    return {"pool_size": size, "max_overflow": overflow, "pool_timeout": timeout}
+
+
+
+def _admission_settings(name, default):
+    """Read "max_in_flight,max_waiting" from ADMISSION_<NAME>."""
+    in_flight, waiting = (int(value) for value in os.getenv(f"ADMISSION_{name}", default).split(","))
+    return {"max_in_flight": in_flight, "max_waiting": waiting}
+
+
 class Config:
     DEBUG = True
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
@@ -14,3 +27,92 @@ class Config:
     DB_NAME = os.getenv("DB_NAME")
 
     SQLALCHEMY_DATABASE_URI = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+    # Separate connection pools per route class (bulkheads) so one slow class
+    # cannot take every connection: "pool_size,max_overflow,pool_timeout"
+    DB_POOLS = {
+        "auth": _pool_settings("AUTH", "2,3,5"),  # login and signup
+        "read": _pool_settings("READ", "4,6,5"),  # GET requests (and each read replica)
+        "write": _pool_settings("WRITE", "3,5,10"),  # other requests, socket events, background work
+        "heavy": _pool_settings("HEAVY", "1,2,30"),  # routes marked @db_pool("heavy"), e.g. board snapshots
+    }
+
+    # Admission control per route class: "max_in_flight,max_waiting", where
+    # max_waiting is the number of requests queued for a pool connection.
+    # Past a limit new requests get 503 with Retry-After; low-priority routes
+    # are turned away at ADMISSION_LOW_PRIORITY_SHARE of it and critical
+    # routes (@priority("critical")) are always admitted.
+    ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+    ADMISSION_LIMITS = {
+        "auth": _admission_settings("AUTH", "50,10"),
+        "read": _admission_settings("READ", "200,20"),
+        "write": _admission_settings("WRITE", "100,20"),
+        "heavy": _admission_settings("HEAVY", "10,3"),
+    }
+    ADMISSION_LOW_PRIORITY_SHARE = float(os.getenv("ADMISSION_LOW_PRIORITY_SHARE", 0.5))
+    ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", 2))  # seconds
+
+    # Read replicas as comma-separated SQLAlchemy URLs. GET requests read from
+    # them; empty sends everything to the primary.
+    DB_REPLICA_URIS = [uri.strip() for uri in os.getenv("DB_REPLICA_URIS", "").split(",") if uri.strip()]
+    # Replication lag to inject, for a stand-in replica on the primary's own URL (local testing only)
+    DB_REPLICA_LAG = float(os.getenv("DB_REPLICA_LAG", 0))  # seconds
+    # After a write, the writer's reads and cache fills for the board use the primary for this long
+    DB_READ_YOUR_WRITES_WINDOW = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", 5))  # seconds
+    # Where recent writers are remembered: "redis" (shared by all workers) or "memory"
+    DB_STICKINESS_STORE = os.getenv("DB_STICKINESS_STORE", "memory")
+
+    REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+    REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+    REDIS_URL = os.getenv("REDIS_URL", f"redis://{REDIS_HOST}:{REDIS_PORT}/0")
+
+    # Set to false when running several workers: a per-process SimpleCache
+    # would let each worker serve its own stale copy
+    CACHE_ALLOW_FALLBACK = os.getenv("CACHE_ALLOW_FALLBACK", "true").lower() == "true"
+
+    # Socket.IO message queue that fans events out across workers, e.g. the
+    # Redis URL. Empty keeps everything in process (single worker, local dev).
+    SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")
+
+    # Socket connection tracking: "redis" (shared by all workers) or "memory"
+    CONNECTION_REGISTRY = os.getenv("CONNECTION_REGISTRY", "memory")
+    # Workers refresh their sockets' entries every CONNECTION_HEARTBEAT_INTERVAL;
+    # entries not refreshed for CONNECTION_TTL (a crashed worker's) are dropped
+    CONNECTION_HEARTBEAT_INTERVAL = int(os.getenv("CONNECTION_HEARTBEAT_INTERVAL", 20))  # seconds
+    CONNECTION_TTL = int(os.getenv("CONNECTION_TTL", 60))  # seconds
+
+    # Numbered board events replayed to reconnecting clients: "redis" or "memory"
+    BOARD_EVENT_LOG = os.getenv("BOARD_EVENT_LOG", "memory")
+    BOARD_EVENT_BUFFER_SIZE = int(os.getenv("BOARD_EVENT_BUFFER_SIZE", 200))  # events kept per board
+    BOARD_EVENT_LOG_TTL = int(os.getenv("BOARD_EVENT_LOG_TTL", 86400))  # seconds since the board's last event
+
+    # Hold board events this long and send them as one board:batch frame; 0 disables batching
+    BOARD_EVENT_BATCH_WINDOW_MS = int(os.getenv("BOARD_EVENT_BATCH_WINDOW_MS", 0))
+
+    # "full" sends whole cards in card:updated/card:moved, "delta" only the changed fields
+    BOARD_EVENT_FORMAT = os.getenv("BOARD_EVENT_FORMAT", "full")
+
+    # Server-Sent Events streams (GET /boards/<id>/events)
+    SSE_HEARTBEAT_INTERVAL = int(os.getenv("SSE_HEARTBEAT_INTERVAL", 15))  # seconds between keep-alive frames
+    SSE_POLL_INTERVAL = float(os.getenv("SSE_POLL_INTERVAL", 1))  # seconds, checks the Redis log for other workers' events
+    SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", 3000))  # client reconnect delay
+
+    # Let clients opt in to MessagePack board events (needs the msgpack package)
+    SOCKETIO_MSGPACK = os.getenv("SOCKETIO_MSGPACK", "false").lower() == "true"
+    # Bytes above which msgpack payloads and long-polling responses are compressed
+    SOCKETIO_COMPRESSION_THRESHOLD = int(os.getenv("SOCKETIO_COMPRESSION_THRESHOLD", 1024))
+
+    # Bearer token required by GET /api/metrics; empty disables the endpoint
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Authenticated-user cache used by token_required
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 300))  # seconds
+
+    # Board ACL cache used by the board_*_required decorators
+    BOARD_ACL_CACHE_SIZE = int(os.getenv("BOARD_ACL_CACHE_SIZE", 10000))
+    BOARD_ACL_LOCAL_TTL = int(os.getenv("BOARD_ACL_LOCAL_TTL", 10))  # seconds, per process
+    BOARD_ACL_REDIS_TTL = int(os.getenv("BOARD_ACL_REDIS_TTL", 300))  # seconds
+
+    # Dashboard board listing (GET /boards?limit=)
+    BOARDS_PAGE_MAX_LIMIT = int(os.getenv("BOARDS_PAGE_MAX_LIMIT", 100))
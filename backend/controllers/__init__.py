@@ -1,6 +1,9 @@
 from controllers.auth_controller import signup, login
 from controllers.board_controller import (
     get_boards,
+    get_board_snapshot,
+    get_board_presence,
+    stream_board_events,
     create_board,
     update_board,
     delete_board
@@ -16,6 +19,9 @@ __all__ = [
     'signup',
     'login',
     'get_boards',
+    'get_board_snapshot',
+    'get_board_presence',
+    'stream_board_events',
     'create_board',
     'update_board',
     'delete_board',
@@ -5,13 +5,7 @@ import jwt
 from datetime import datetime, timedelta
 from config import Config
 import uuid
-from utils import logger, with_db_session, success_response, bad_request_response, unauthorized_response
-
-
-def check_existing_user(session, email):
-    """Check if a user with the given email exists"""
-    user = session.query(User).filter_by(email=email).first()
-    return user is not None
+from utils import logger, with_db_session, success_response, bad_request_response, unauthorized_response, insert_if_absent
 
 
 @with_db_session
@@ -20,9 +14,6 @@ def signup(session):
     schema = SignupSchema()
     data = schema.load(request.json)
 
-    if check_existing_user(session, data['email']):
-        return bad_request_response("Email already registered")
-
     new_user = User(
         user_id=uuid.uuid4(),
         name=data['name'],
@@ -31,8 +22,21 @@ def signup(session):
     )
     new_user.set_password(data['password'])
 
-    session.add(new_user)
-    session.flush()
+    # Single statement: the unique email index decides whether it is taken
+    user_id = insert_if_absent(
+        session, User,
+        {
+            "user_id": new_user.user_id,
+            "name": new_user.name,
+            "email": new_user.email,
+            "phone": new_user.phone,
+            "password": new_user.password
+        },
+        ["email"]
+    )
+
+    if user_id is None:
+        return bad_request_response("Email already registered")
     
     logger.info(f"User registered: {new_user.email}")
 
@@ -1,42 +1,130 @@
-from flask import request, g
+from flask import request, g, Response
 from models import Board, BoardMember
-from schemas.board_schema import BoardSchema, CreateBoardSchema, UpdateBoardSchema
+from schemas.board_schema import BoardSchema, BoardSummarySchema, CreateBoardSchema, UpdateBoardSchema
+from schemas.label_schema import LabelSchema
 import uuid
-from utils.cache import cache
 from utils import (
-    logger, with_db_session,
-    success_response, parse_uuid,
-    board_owner_required,
-    get_board_with_relations,
-    emit_to_board
+    logger, with_db_session, cached_board_read, invalidate_board,
+    success_response, parse_uuid, encode_cursor, parse_cursor, bad_request_response,
+    board_owner_required, board_access_required,
+    get_board_with_relations, get_boards_for_user,
+    get_labels_by_board, get_list_rows_with_cards,
+    publish_board_event
 )
+from utils.acl import invalidate_board_acl
+from utils.presence import board_viewers
+from utils.sse import board_event_stream
+from utils.serializers import dump_lists_with_cards
+from config import Config
 from sqlalchemy.orm import joinedload
 
 
 @with_db_session
 def get_boards(session):
-    """Get all boards for the current user (owned and member)"""
+    """
+    Get the boards of the current user (owned and member).
+
+    Query parameters:
+        limit: page size; all boards are returned when omitted
+        after: next_cursor of the previous page
+        members: "count" to return member_count instead of member arrays
+    """
     current_user = g.current_user
-    
-    owned_boards = session.query(Board).filter_by(owner_id=current_user.user_id).all()
-    member_boards = session.query(Board).join(BoardMember).filter(
-        BoardMember.user_id == current_user.user_id
-    ).all()
-
-    all_boards = list({board.board_id: board for board in owned_boards + member_boards}.values())
-
-    boards_with_relations = []
-    for board in all_boards:
-        board_with_relations = session.query(Board).options(
-            joinedload(Board.owner),
-            joinedload(Board.members).joinedload(BoardMember.user)
-        ).filter_by(board_id=board.board_id).first()
-        boards_with_relations.append(board_with_relations)
-
-    board_schema = BoardSchema(many=True)
+
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return bad_request_response("limit must be an integer")
+        if not 1 <= limit <= Config.BOARDS_PAGE_MAX_LIMIT:
+            return bad_request_response(f"limit must be between 1 and {Config.BOARDS_PAGE_MAX_LIMIT}")
+
+    after = request.args.get('after')
+    if after is not None:
+        values, error = parse_cursor(after, 2, "after")
+        if error:
+            return error
+        after_name, after_id = values
+        after_id, error = parse_uuid(after_id, "after")
+        if error:
+            return error
+        after = (after_name, after_id)
+
+    include_members = request.args.get('members') != 'count'
+
+    # Fetch one extra row to know whether there is a next page
+    boards = get_boards_for_user(
+        session, current_user.user_id,
+        limit=limit + 1 if limit else None,
+        after=after,
+        include_members=include_members
+    )
+
+    next_cursor = None
+    if limit and len(boards) > limit:
+        boards = boards[:limit]
+        next_cursor = encode_cursor(boards[-1].name, boards[-1].board_id)
+
+    board_schema = BoardSchema(many=True) if include_members else BoardSummarySchema(many=True)
     return success_response(
         "Boards retrieved successfully",
-        {"boards": board_schema.dump(boards_with_relations)}
+        {"boards": board_schema.dump(boards), "next_cursor": next_cursor}
+    )
+
+
+@with_db_session
+@board_access_required('board', 'board_id')
+def get_board_snapshot(session, board_id):
+    """Get a board with its members, labels, lists and cards in a single response"""
+    board_uuid = g.board_id  # Set by decorator
+
+    snapshot_data = cached_board_read(
+        board_uuid, "snapshot",
+        lambda: {
+            "board": BoardSchema().dump(get_board_with_relations(session, board_uuid)),
+            "labels": LabelSchema(many=True).dump(get_labels_by_board(session, board_uuid)),
+            "lists": dump_lists_with_cards(get_list_rows_with_cards(session, board_uuid))
+        }
+    )
+
+    return success_response(
+        "Board snapshot retrieved successfully",
+        snapshot_data
+    )
+
+
+@with_db_session
+@board_access_required('board', 'board_id')
+def stream_board_events(session, board_id):
+    """
+    Stream the board's events as Server-Sent Events.
+    Resumes after the Last-Event-ID header (or ?last_event_id=) if given.
+    """
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    last_seq = None
+    if last_event_id is not None:
+        try:
+            last_seq = int(last_event_id)
+        except ValueError:
+            return bad_request_response("Invalid Last-Event-ID")
+        if last_seq < 0:
+            return bad_request_response("Invalid Last-Event-ID")
+
+    stream = board_event_stream(str(g.board_id), g.current_user.user_id, last_seq)
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Stop nginx from buffering the stream
+    })
+
+
+@with_db_session
+@board_access_required('board', 'board_id')
+def get_board_presence(session, board_id):
+    """Get the users currently viewing a board"""
+    return success_response(
+        "Board viewers retrieved successfully",
+        {"viewers": board_viewers(g.board_id)}
     )
 
 
@@ -57,7 +145,6 @@ def create_board(session):
     session.add(new_board)
     session.flush()
     
-    cache.delete(f"user_{current_user.user_id}_boards")
     logger.info(f"Board created: {new_board.name} by {current_user.email}")
 
     board_with_relations = session.query(Board).options(
@@ -78,39 +165,28 @@ def create_board(session):
 def update_board(session, board_id):
     """Update a board (owner only)"""
     schema = UpdateBoardSchema()
-    board = g.board  # Set by decorator
     
     data = schema.load(request.json)
 
+    board = get_board_with_relations(session, g.board_id)
     board.name = data['name']
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_boards")
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_lists")
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_labels")
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_members")
+    invalidate_board(session, board.board_id)
     logger.info(f"Board updated: {board.name}")
 
-    board_with_relations = session.query(Board).options(
-        joinedload(Board.owner),
-        joinedload(Board.members).joinedload(BoardMember.user)
-    ).filter_by(board_id=board.board_id).first()
-
     board_schema = BoardSchema()
-    board_data = board_schema.dump(board_with_relations)
+    board_data = board_schema.dump(board)
     
     response = success_response(
         "Board updated successfully",
         {"board": board_data}
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'board:updated', {
-            'board': board_data
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, board.board_id, 'board:updated', {
+        'board': board_data
+    })
     
     return response
 
@@ -119,12 +195,13 @@ def update_board(session, board_id):
 @board_owner_required('board_id')
 def delete_board(session, board_id):
     """Delete a board (owner only)"""
-    board = g.board  # Set by decorator
+    board = session.get(Board, g.board_id)
 
     session.delete(board)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_boards")
+    invalidate_board(session, board.board_id)
+    invalidate_board_acl(session, board.board_id)
     logger.info(f"Board deleted: {board.name}")
 
     return success_response("Board deleted successfully")
@@ -4,14 +4,14 @@ from models.enums import BoardRole
 from schemas.board_schema import InviteMemberSchema, UpdateMemberRoleSchema, BoardMemberSchema, BoardMembersResponseSchema
 from marshmallow import ValidationError
 import uuid
-from utils.cache import cache
 from utils import (
-    logger, with_db_session,
+    logger, with_db_session, cached_board_read, invalidate_board,
     success_response, parse_uuid, not_found_response, bad_request_response,
     board_access_required, board_admin_required,
-    get_board_with_relations, get_board_member_with_user,
-    emit_to_board
+    get_board_with_relations, get_board_member_with_user, insert_if_absent,
+    publish_board_event
 )
+from utils.acl import invalidate_board_acl
 
 
 @with_db_session
@@ -19,7 +19,7 @@ from utils import (
 def invite_member(session, board_id):
     """Invite a member to a board (admins and owner only)"""
     schema = InviteMemberSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     board_uuid, error = parse_uuid(board_id, "board ID")
     if error:
@@ -32,31 +32,28 @@ def invite_member(session, board_id):
     if not user_to_invite:
         return not_found_response("User with this email")
 
-    if user_to_invite.user_id == board.owner_id:
+    if user_to_invite.user_id == access.owner_id:
         return bad_request_response("Board owner is already part of the board")
 
-    existing_member = session.query(BoardMember).filter_by(
-        board_id=board_uuid,
-        user_id=user_to_invite.user_id
-    ).first()
-
-    if existing_member:
-        return bad_request_response("User is already a member of this board")
-
-    new_member = BoardMember(
-        member_id=uuid.uuid4(),
-        board_id=board_uuid,
-        user_id=user_to_invite.user_id,
-        role=BoardRole.VIEWER
+    member_id = insert_if_absent(
+        session, BoardMember,
+        {
+            "member_id": uuid.uuid4(),
+            "board_id": board_uuid,
+            "user_id": user_to_invite.user_id,
+            "role": BoardRole.VIEWER
+        },
+        ["board_id", "user_id"]
     )
 
-    session.add(new_member)
-    session.flush()
+    if member_id is None:
+        return bad_request_response("User is already a member of this board")
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_members")
+    invalidate_board(session, access.board_id)
+    invalidate_board_acl(session, access.board_id)
     logger.info(f"Member invited to board: {data['email']}")
 
-    member_with_user = get_board_member_with_user(session, new_member.member_id)
+    member_with_user = get_board_member_with_user(session, member_id)
 
     member_schema = BoardMemberSchema()
     member_data = member_schema.dump(member_with_user)
@@ -67,13 +64,10 @@ def invite_member(session, board_id):
         201
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'board:member_added', {
-            'member': member_data
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'board:member_added', {
+        'member': member_data
+    })
     
     return response
 
@@ -82,13 +76,16 @@ def invite_member(session, board_id):
 @board_access_required('board', 'board_id')
 def get_board_members(session, board_id):
     """Get all members of a board"""
-    board = g.board  # Set by decorator (already has owner and members loaded)
+    access = g.board_access  # Set by decorator
     
-    response_schema = BoardMembersResponseSchema()
-    response_data = response_schema.dump({
-        'owner': board.owner,
-        'members': board.members
-    })
+    def load_members():
+        board = get_board_with_relations(session, access.board_id)
+        return BoardMembersResponseSchema().dump({
+            'owner': board.owner,
+            'members': board.members
+        })
+
+    response_data = cached_board_read(access.board_id, "members", load_members)
 
     return success_response(
         "Board members retrieved successfully",
@@ -101,7 +98,7 @@ def get_board_members(session, board_id):
 def update_member_role(session, board_id, user_id):
     """Update a member's role (admins and owner only)"""
     schema = UpdateMemberRoleSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     board_uuid, error = parse_uuid(board_id, "board ID")
     if error:
@@ -113,7 +110,7 @@ def update_member_role(session, board_id, user_id):
 
     data = schema.load(request.json)
 
-    if user_uuid == board.owner_id:
+    if user_uuid == access.owner_id:
         return bad_request_response("Cannot change the board owner's role")
 
     member = session.query(BoardMember).filter_by(
@@ -127,7 +124,8 @@ def update_member_role(session, board_id, user_id):
     member.role = BoardRole[data['role'].upper()]
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_members")
+    invalidate_board(session, access.board_id)
+    invalidate_board_acl(session, access.board_id)
     logger.info(f"Member role updated: {data['role']}")
 
     member_with_user = get_board_member_with_user(session, member.member_id)
@@ -140,13 +138,10 @@ def update_member_role(session, board_id, user_id):
         {"member": member_data}
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'board:member_role_updated', {
-            'member': member_data
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'board:member_role_updated', {
+        'member': member_data
+    })
     
     return response
 
@@ -155,7 +150,7 @@ def update_member_role(session, board_id, user_id):
 @board_admin_required('board_id')
 def remove_member(session, board_id, user_id):
     """Remove a member from a board (admins and owner only)"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     board_uuid, error = parse_uuid(board_id, "board ID")
     if error:
@@ -165,7 +160,7 @@ def remove_member(session, board_id, user_id):
     if error:
         return error
 
-    if user_uuid == board.owner_id:
+    if user_uuid == access.owner_id:
         return bad_request_response("Cannot remove the board owner")
 
     member = session.query(BoardMember).filter_by(
@@ -179,17 +174,15 @@ def remove_member(session, board_id, user_id):
     session.delete(member)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_members")
+    invalidate_board(session, access.board_id)
+    invalidate_board_acl(session, access.board_id)
     logger.info(f"Member removed from board: {user_uuid}")
 
     response = success_response("Member removed successfully")
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'board:member_removed', {
-            'user_id': user_id
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'board:member_removed', {
+        'user_id': user_id
+    })
 
     return response
@@ -3,30 +3,37 @@ from models import Card, CardLabel, CardAssignee, List, Board, BoardMember
 from schemas.card_schema import CardSchema, CreateCardSchema, UpdateCardSchema, CardAssigneeSchema
 from marshmallow import ValidationError
 import uuid
-from utils.cache import cache
 from utils import (
-    logger, with_db_session,
+    logger, with_db_session, cached_board_read, invalidate_board,
     success_response, parse_uuid, not_found_response, bad_request_response,
     board_access_required, board_editor_required,
-    get_cards_by_list, get_card_with_relations,
-    emit_to_board
+    get_card_rows, get_card_with_relations, insert_if_absent, get_request_json,
+    publish_board_event
 )
+from utils.ranking import rank_for_append, rank_for_position
+from utils.acl import get_board_acl
+from utils.deltas import CARD_PATCH_FIELDS, changed_fields, card_event
+from utils.serializers import dump_cards
 
 
 @with_db_session
 @board_access_required('list', 'list_id')
 def get_cards(session, list_id):
     """Get all cards for a list"""
+    access = g.board_access  # Set by decorator
+    
     list_uuid, error = parse_uuid(list_id, "list ID")
     if error:
         return error
     
-    cards = get_cards_by_list(session, list_uuid)
+    cards_data = cached_board_read(
+        access.board_id, f"list_{list_uuid}_cards",
+        lambda: dump_cards(get_card_rows(session, [list_uuid]))
+    )
     
-    card_schema = CardSchema(many=True)
     return success_response(
         "Cards retrieved successfully",
-        {"data": card_schema.dump(cards)}
+        {"data": cards_data}
     )
 
 
@@ -35,7 +42,7 @@ def get_cards(session, list_id):
 def create_card(session, list_id):
     """Create a new card"""
     schema = CreateCardSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     list_uuid, error = parse_uuid(list_id, "list ID")
     if error:
@@ -43,8 +50,8 @@ def create_card(session, list_id):
 
     data = schema.load(request.json)
 
-    # Get the next position
-    max_position = session.query(Card).filter_by(list_id=list_uuid).count()
+    # Append after the last card
+    rank, _ = rank_for_append(session, Card, list_uuid)
 
     new_card = Card(
         card_id=uuid.uuid4(),
@@ -52,13 +59,13 @@ def create_card(session, list_id):
         title=data['title'],
         description=data.get('description'),
         due_date=data.get('due_date'),
-        position=max_position
+        rank=rank
     )
 
     session.add(new_card)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_list_{list_id}_cards")
+    invalidate_board(session, access.board_id)
     logger.info(f"Card created: {data['title']}")
 
     # Reload with labels and assignees
@@ -73,14 +80,11 @@ def create_card(session, list_id):
         201
     )
     
-    # Emit WebSocket event (safe - won't break operation if it fails)
-    try:
-        emit_to_board(board.board_id, 'card:created', {
-            'card': card_data,
-            'list_id': str(list_uuid)
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:created', {
+        'card': card_data,
+        'list_id': str(list_uuid)
+    })
     
     return response
 
@@ -90,13 +94,13 @@ def create_card(session, list_id):
 def update_card(session, card_id):
     """Update a card"""
     schema = UpdateCardSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
         return error
 
-    data = schema.load(request.json)
+    data = schema.load(get_request_json())
     
     card = session.query(Card).filter_by(card_id=card_uuid).first()
     if not card:
@@ -112,48 +116,21 @@ def update_card(session, card_id):
         if not new_list:
             return not_found_response("Target list")
         
-        if new_list.board_id != board.board_id:
+        if new_list.board_id != access.board_id:
             return bad_request_response("Cannot move card to a different board")
 
-        # Shift positions in old list
-        old_list_cards = session.query(Card).filter(
-            Card.list_id == old_list_id,
-            Card.position > card.position
-        ).all()
-        for c in old_list_cards:
-            c.position -= 1
-
         # Add to end of new list
-        max_position_new = session.query(Card).filter_by(list_id=new_list_uuid).count()
+        card.rank, _ = rank_for_append(session, Card, new_list_uuid)
         card.list_id = new_list_uuid
-        card.position = max_position_new
 
     # Handle position change within same list
     elif 'position' in data and 'list_id' not in data:
         new_position = data['position']
-        old_position = card.position
         
-        if new_position != old_position:
-            if new_position > old_position:
-                # Moving down
-                cards_to_shift = session.query(Card).filter(
-                    Card.list_id == card.list_id,
-                    Card.position > old_position,
-                    Card.position <= new_position
-                ).all()
-                for c in cards_to_shift:
-                    c.position -= 1
-            else:
-                # Moving up
-                cards_to_shift = session.query(Card).filter(
-                    Card.list_id == card.list_id,
-                    Card.position >= new_position,
-                    Card.position < old_position
-                ).all()
-                for c in cards_to_shift:
-                    c.position += 1
-            
-            card.position = new_position
+        if new_position != card.position:
+            card.rank, _ = rank_for_position(
+                session, Card, card.list_id, new_position, exclude_id=card.card_id
+            )
 
     # Update card fields
     if 'title' in data:
@@ -163,12 +140,10 @@ def update_card(session, card_id):
     if 'due_date' in data:
         card.due_date = data['due_date']
 
+    changed = changed_fields(card, CARD_PATCH_FIELDS)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_list_{old_list_id}_cards")
-    if 'list_id' in data and data['list_id'] != old_list_id:
-        cache.delete(f"user_{g.current_user.user_id}_list_{data['list_id']}_cards")
-    cache.delete(f"user_{g.current_user.user_id}_card_{card_id}_comments")
+    invalidate_board(session, access.board_id)
     logger.info(f"Card updated: {card_id}")
 
     # Reload with labels and assignees
@@ -182,14 +157,11 @@ def update_card(session, card_id):
         {"data": card_data}
     )
     
-    # Emit WebSocket event (safe - won't break operation if it fails)
-    try:
-        emit_to_board(board.board_id, 'card:updated', {
-            'card': card_data,
-            'old_list_id': str(old_list_id)
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:updated', card_event(
+        card_data, changed,
+        old_list_id=str(old_list_id)
+    ))
     
     return response
 
@@ -198,7 +170,7 @@ def update_card(session, card_id):
 @board_editor_required('card', 'card_id')
 def delete_card(session, card_id):
     """Delete a card"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
@@ -208,31 +180,20 @@ def delete_card(session, card_id):
     if not card:
         return not_found_response("Card")
 
-    # Reorder remaining cards
-    cards_to_reorder = session.query(Card).filter(
-        Card.list_id == card.list_id,
-        Card.position > card.position
-    ).all()
-    for c in cards_to_reorder:
-        c.position -= 1
-
     list_id = str(card.list_id)
     session.delete(card)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_list_{card.list_id}_cards")
+    invalidate_board(session, access.board_id)
     logger.info(f"Card deleted: {card_id}")
 
     response = success_response("Card deleted successfully")
     
-    # Emit WebSocket event (safe - won't break operation if it fails)
-    try:
-        emit_to_board(board.board_id, 'card:deleted', {
-            'card_id': card_id,
-            'list_id': list_id
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:deleted', {
+        'card_id': card_id,
+        'list_id': list_id
+    })
 
     return response
 
@@ -241,13 +202,13 @@ def delete_card(session, card_id):
 @board_editor_required('card', 'card_id')
 def move_card(session, card_id):
     """Move a card to a new list and/or position"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
         return error
 
-    data = request.json
+    data = get_request_json()
     if not data or 'new_list_id' not in data or 'new_position' not in data:
         return bad_request_response("new_list_id and new_position are required")
 
@@ -265,67 +226,30 @@ def move_card(session, card_id):
     if not new_list:
         return not_found_response("Target list")
 
-    if new_list.board_id != board.board_id:
+    if new_list.board_id != access.board_id:
         return bad_request_response("Cannot move card to a different board")
 
     old_list_id = card.list_id
     old_position = card.position
 
-    if old_list_id == new_list_uuid:
-        # Moving within same list
-        if old_position == new_position:
-            card_schema = CardSchema()
-            return success_response(
-                "Card position unchanged",
-                {"data": card_schema.dump(card)}
-            )
-
-        if new_position > old_position:
-            # Moving down
-            cards_to_shift = session.query(Card).filter(
-                Card.list_id == card.list_id,
-                Card.position > old_position,
-                Card.position <= new_position
-            ).all()
-            for c in cards_to_shift:
-                c.position -= 1
-        else:
-            # Moving up
-            cards_to_shift = session.query(Card).filter(
-                Card.list_id == card.list_id,
-                Card.position >= new_position,
-                Card.position < old_position
-            ).all()
-            for c in cards_to_shift:
-                c.position += 1
-
-        card.position = new_position
-    else:
-        # Moving to different list
-        # Shift positions in old list
-        old_list_cards = session.query(Card).filter(
-            Card.list_id == old_list_id,
-            Card.position > old_position
-        ).all()
-        for c in old_list_cards:
-            c.position -= 1
-
-        # Make space in new list
-        new_list_cards = session.query(Card).filter(
-            Card.list_id == new_list_uuid,
-            Card.position >= new_position
-        ).all()
-        for c in new_list_cards:
-            c.position += 1
-
-        card.list_id = new_list_uuid
-        card.position = new_position
+    # Moving within same list to the same position
+    if old_list_id == new_list_uuid and old_position == new_position:
+        card_schema = CardSchema()
+        return success_response(
+            "Card position unchanged",
+            {"data": card_schema.dump(card)}
+        )
+
+    # Only the moved card is written; siblings keep their ranks
+    card.rank, new_position = rank_for_position(
+        session, Card, new_list_uuid, new_position, exclude_id=card.card_id
+    )
+    card.list_id = new_list_uuid
 
+    changed = changed_fields(card, CARD_PATCH_FIELDS)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_list_{old_list_id}_cards")
-    if old_list_id != new_list_uuid:
-        cache.delete(f"user_{g.current_user.user_id}_list_{new_list_uuid}_cards")
+    invalidate_board(session, access.board_id)
     logger.info(f"Card moved: {card_id} to list {new_list_uuid} at position {new_position}")
 
     # Reload with labels and assignees
@@ -340,16 +264,13 @@ def move_card(session, card_id):
         {"data": card_data}
     )
     
-    # Emit WebSocket event (in try-except to prevent it from breaking the operation)
-    try:
-        emit_to_board(board.board_id, 'card:moved', {
-            'card': card_data,
-            'old_list_id': str(old_list_id),
-            'new_list_id': str(new_list_uuid),
-            'new_position': new_position
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:moved', card_event(
+        card_data, changed,
+        old_list_id=str(old_list_id),
+        new_list_id=str(new_list_uuid),
+        new_position=new_position
+    ))
     
     return response
 
@@ -358,7 +279,7 @@ def move_card(session, card_id):
 @board_access_required('card', 'card_id')
 def assign_user_to_card(session, card_id):
     """Assign a user to a card"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
@@ -373,40 +294,27 @@ def assign_user_to_card(session, card_id):
         return error
 
     # Check if the user to be assigned is a board member or owner
-    user_is_owner = board.owner_id == user_uuid
-    user_is_member = any(member.user_id == user_uuid for member in board.members)
-
-    if not (user_is_owner or user_is_member):
+    if not get_board_acl(session, access.board_id).has_access(user_uuid):
         return bad_request_response("User is not a member of this board")
 
-    # Check if user is already assigned
-    existing_assignment = session.query(CardAssignee).filter_by(
-        card_id=card_uuid,
-        user_id=user_uuid
-    ).first()
-
-    if existing_assignment:
-        return bad_request_response("User is already assigned to this card")
-
-    # Create assignment
-    new_assignment = CardAssignee(
-        id=uuid.uuid4(),
-        card_id=card_uuid,
-        user_id=user_uuid
+    # Create assignment unless the user is already assigned
+    assignment_id = insert_if_absent(
+        session, CardAssignee,
+        {"id": uuid.uuid4(), "card_id": card_uuid, "user_id": user_uuid},
+        ["card_id", "user_id"]
     )
 
-    session.add(new_assignment)
-    session.flush()
+    if assignment_id is None:
+        return bad_request_response("User is already assigned to this card")
     
-    # Invalidate card comments cache since card details changed
-    cache.delete(f"user_{g.current_user.user_id}_card_{card_id}_comments")
+    invalidate_board(session, access.board_id)
     logger.info(f"User {user_uuid} assigned to card {card_id}")
 
     # Reload with user data
     from sqlalchemy.orm import joinedload
     assignment_with_user = session.query(CardAssignee).options(
         joinedload(CardAssignee.user)
-    ).filter_by(id=new_assignment.id).first()
+    ).filter_by(id=assignment_id).first()
 
     assignee_schema = CardAssigneeSchema()
     assignee_data = assignee_schema.dump(assignment_with_user)
@@ -417,14 +325,11 @@ def assign_user_to_card(session, card_id):
         201
     )
     
-    # Emit WebSocket event (safe - won't break operation if it fails)
-    try:
-        emit_to_board(board.board_id, 'card:assignee_added', {
-            'card_id': card_id,
-            'assignee': assignee_data
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:assignee_added', {
+        'card_id': card_id,
+        'assignee': assignee_data
+    })
     
     return response
 
@@ -433,7 +338,7 @@ def assign_user_to_card(session, card_id):
 @board_access_required('card', 'card_id')
 def unassign_user_from_card(session, card_id, user_id):
     """Remove a user assignment from a card"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
@@ -455,19 +360,15 @@ def unassign_user_from_card(session, card_id, user_id):
     session.delete(assignment)
     session.flush()
     
-    # Invalidate card comments cache since card details changed
-    cache.delete(f"user_{g.current_user.user_id}_card_{card_id}_comments")
+    invalidate_board(session, access.board_id)
     logger.info(f"User {user_id} unassigned from card {card_id}")
 
     response = success_response("User unassigned from card successfully")
     
-    # Emit WebSocket event (safe - won't break operation if it fails)
-    try:
-        emit_to_board(board.board_id, 'card:assignee_removed', {
-            'card_id': card_id,
-            'user_id': user_id
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:assignee_removed', {
+        'card_id': card_id,
+        'user_id': user_id
+    })
 
     return response
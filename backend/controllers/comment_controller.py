@@ -3,13 +3,12 @@ from models import Comment
 from schemas.comment_schema import CommentSchema, CreateCommentSchema
 from marshmallow import ValidationError
 import uuid
-from utils.cache import cache
 from utils import (
-    logger, with_db_session,
+    logger, with_db_session, cached_board_read, invalidate_board,
     success_response, parse_uuid, not_found_response,
     board_access_required,
     get_comments_by_card, get_comment_with_relations,
-    emit_to_board
+    publish_board_event
 )
 
 
@@ -17,16 +16,20 @@ from utils import (
 @board_access_required('card', 'card_id')
 def get_card_comments(session, card_id):
     """Get all comments for a specific card"""
+    access = g.board_access  # Set by decorator
+    
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
         return error
     
-    comments = get_comments_by_card(session, card_uuid)
+    comments_data = cached_board_read(
+        access.board_id, f"card_{card_uuid}_comments",
+        lambda: CommentSchema(many=True).dump(get_comments_by_card(session, card_uuid))
+    )
     
-    comment_schema = CommentSchema(many=True)
     return success_response(
         "Comments retrieved successfully",
-        {"data": comment_schema.dump(comments)}
+        {"data": comments_data}
     )
 
 
@@ -35,6 +38,7 @@ def get_card_comments(session, card_id):
 def create_comment(session, card_id):
     """Create a new comment on a card"""
     current_user = g.current_user
+    access = g.board_access  # Set by decorator
     schema = CreateCommentSchema()
     
     card_uuid, error = parse_uuid(card_id, "card ID")
@@ -54,7 +58,7 @@ def create_comment(session, card_id):
     session.add(new_comment)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_card_{card_id}_comments")
+    invalidate_board(session, access.board_id)
     logger.info(f"Comment created on card {card_id} by user {current_user.user_id}")
 
     # Reload with user data
@@ -63,22 +67,17 @@ def create_comment(session, card_id):
     comment_schema = CommentSchema()
     comment_data = comment_schema.dump(new_comment)
     
-    board = g.board  # Set by decorator
-    
     response = success_response(
         "Comment created successfully",
         {"data": comment_data},
         201
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'comment:created', {
-            'comment': comment_data,
-            'card_id': card_id
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'comment:created', {
+        'comment': comment_data,
+        'card_id': card_id
+    })
     
     return response
 
@@ -88,7 +87,7 @@ def create_comment(session, card_id):
 def delete_comment(session, card_id, comment_id):
     """Delete a comment from a card"""
     current_user = g.current_user
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
@@ -108,25 +107,22 @@ def delete_comment(session, card_id, comment_id):
         return not_found_response("Comment on this card")
     
     # Only comment author or board owner can delete
-    if comment.user_id != current_user.user_id and board.owner_id != current_user.user_id:
+    if comment.user_id != current_user.user_id and access.owner_id != current_user.user_id:
         from utils import forbidden_response
         return forbidden_response("Only comment author or board owner can delete comments")
 
     session.delete(comment)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_card_{card_id}_comments")
+    invalidate_board(session, access.board_id)
     logger.info(f"Comment {comment_id} deleted from card {card_id}")
 
     response = success_response("Comment deleted successfully")
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'comment:deleted', {
-            'comment_id': comment_id,
-            'card_id': card_id
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'comment:deleted', {
+        'comment_id': comment_id,
+        'card_id': card_id
+    })
 
     return response
@@ -3,13 +3,12 @@ from models import Label, Card, CardLabel
 from schemas.label_schema import LabelSchema, CreateLabelSchema, UpdateLabelSchema, CardLabelSchema
 from marshmallow import ValidationError
 import uuid
-from utils.cache import cache
 from utils import (
-    logger, with_db_session,
+    logger, with_db_session, cached_board_read, invalidate_board,
     success_response, parse_uuid, not_found_response, bad_request_response,
     board_access_required, board_editor_required,
-    get_labels_by_board, get_label_with_board,
-    emit_to_board
+    get_labels_by_board, get_label_with_board, insert_if_absent,
+    publish_board_event
 )
 from sqlalchemy.orm import joinedload
 
@@ -18,16 +17,16 @@ from sqlalchemy.orm import joinedload
 @board_access_required('board', 'board_id')
 def get_board_labels(session, board_id):
     """Get all labels for a board"""
-    board_uuid, error = parse_uuid(board_id, "board ID")
-    if error:
-        return error
+    access = g.board_access  # Set by decorator
     
-    labels = get_labels_by_board(session, board_uuid)
+    labels_data = cached_board_read(
+        access.board_id, "labels",
+        lambda: LabelSchema(many=True).dump(get_labels_by_board(session, access.board_id))
+    )
     
-    label_schema = LabelSchema(many=True)
     return success_response(
         "Labels retrieved successfully",
-        {"data": label_schema.dump(labels)}
+        {"data": labels_data}
     )
 
 
@@ -36,7 +35,7 @@ def get_board_labels(session, board_id):
 def create_label(session, board_id):
     """Create a new label for a board"""
     schema = CreateLabelSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     board_uuid, error = parse_uuid(board_id, "board ID")
     if error:
@@ -54,8 +53,8 @@ def create_label(session, board_id):
     session.add(new_label)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_labels")
-    logger.info(f"Label created: {new_label.name} for board {board.name}")
+    invalidate_board(session, access.board_id)
+    logger.info(f"Label created: {new_label.name} for board {access.board_id}")
 
     label_schema = LabelSchema()
     return success_response(
@@ -70,7 +69,7 @@ def create_label(session, board_id):
 def update_label(session, label_id):
     """Update a label"""
     schema = UpdateLabelSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     label_uuid, error = parse_uuid(label_id, "label ID")
     if error:
@@ -89,7 +88,7 @@ def update_label(session, label_id):
 
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board.board_id}_labels")
+    invalidate_board(session, access.board_id)
     logger.info(f"Label updated: {label.name}")
 
     label_schema = LabelSchema()
@@ -103,7 +102,7 @@ def update_label(session, label_id):
 @board_access_required('label', 'label_id')
 def delete_label(session, label_id):
     """Delete a label"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     label_uuid, error = parse_uuid(label_id, "label ID")
     if error:
@@ -117,7 +116,7 @@ def delete_label(session, label_id):
     session.delete(label)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board.board_id}_labels")
+    invalidate_board(session, access.board_id)
     logger.info(f"Label deleted: {label_name}")
 
     return success_response("Label deleted successfully")
@@ -127,7 +126,7 @@ def delete_label(session, label_id):
 @board_access_required('card', 'card_id')
 def add_label_to_card(session, card_id, label_id):
     """Add a label to a card"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
@@ -146,33 +145,25 @@ def add_label_to_card(session, card_id, label_id):
         return not_found_response("Label")
 
     # Check if label belongs to the same board
-    if label.board_id != board.board_id:
+    if label.board_id != access.board_id:
         return bad_request_response("Label does not belong to this board")
 
-    # Check if label is already added to the card
-    existing = session.query(CardLabel).filter_by(
-        card_id=card_uuid,
-        label_id=label_uuid
-    ).first()
-
-    if existing:
-        return bad_request_response("Label already added to this card")
-
-    card_label = CardLabel(
-        id=uuid.uuid4(),
-        card_id=card_uuid,
-        label_id=label_uuid
+    # Add the label unless it is already on the card
+    card_label_id = insert_if_absent(
+        session, CardLabel,
+        {"id": uuid.uuid4(), "card_id": card_uuid, "label_id": label_uuid},
+        ["card_id", "label_id"]
     )
 
-    session.add(card_label)
-    session.flush()
+    if card_label_id is None:
+        return bad_request_response("Label already added to this card")
     
-    cache.delete(f"user_{g.current_user.user_id}_card_{card_id}_comments")
+    invalidate_board(session, access.board_id)
     logger.info(f"Label {label.name} added to card {card.title}")
 
     card_label_with_label = session.query(CardLabel).options(
         joinedload(CardLabel.label)
-    ).filter_by(id=card_label.id).first()
+    ).filter_by(id=card_label_id).first()
 
     card_label_schema = CardLabelSchema()
     card_label_data = card_label_schema.dump(card_label_with_label)
@@ -183,14 +174,11 @@ def add_label_to_card(session, card_id, label_id):
         201
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'card:label_added', {
-            'card_id': card_id,
-            'label': card_label_data
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:label_added', {
+        'card_id': card_id,
+        'label': card_label_data
+    })
     
     return response
 
@@ -199,7 +187,7 @@ def add_label_to_card(session, card_id, label_id):
 @board_access_required('card', 'card_id')
 def remove_label_from_card(session, card_id, label_id):
     """Remove a label from a card"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     card_uuid, error = parse_uuid(card_id, "card ID")
     if error:
@@ -224,18 +212,15 @@ def remove_label_from_card(session, card_id, label_id):
     session.delete(card_label)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_card_{card_id}_comments")
+    invalidate_board(session, access.board_id)
     logger.info(f"Label removed from card {card.title}")
 
     response = success_response("Label removed from card successfully")
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'card:label_removed', {
-            'card_id': card_id,
-            'label_id': label_id
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'card:label_removed', {
+        'card_id': card_id,
+        'label_id': label_id
+    })
 
     return response
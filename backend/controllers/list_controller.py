@@ -3,30 +3,30 @@ from models import List, Card
 from schemas.list_schema import ListSchema, CreateListSchema, UpdateListSchema
 from marshmallow import ValidationError
 import uuid
-from utils.cache import cache
 from utils import (
-    logger, with_db_session,
+    logger, with_db_session, cached_board_read, invalidate_board,
     success_response, parse_uuid, not_found_response, bad_request_response,
     board_access_required, board_editor_required,
-    get_lists_by_board,
-    emit_to_board
+    get_lists_by_board, get_request_json,
+    publish_board_event
 )
+from utils.ranking import rank_for_append, rank_for_position
 
 
 @with_db_session
 @board_access_required('board', 'board_id')
 def get_lists(session, board_id):
     """Get all lists for a board"""
-    board_uuid, error = parse_uuid(board_id, "board ID")
-    if error:
-        return error
+    access = g.board_access  # Set by decorator
     
-    lists = get_lists_by_board(session, board_uuid)
+    lists_data = cached_board_read(
+        access.board_id, "lists",
+        lambda: ListSchema(many=True).dump(get_lists_by_board(session, access.board_id))
+    )
     
-    list_schema = ListSchema(many=True)
     return success_response(
         "Lists retrieved successfully",
-        {"data": list_schema.dump(lists)}
+        {"data": lists_data}
     )
 
 
@@ -35,7 +35,7 @@ def get_lists(session, board_id):
 def create_list(session, board_id):
     """Create a new list on a board"""
     schema = CreateListSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     board_uuid, error = parse_uuid(board_id, "board ID")
     if error:
@@ -43,21 +43,21 @@ def create_list(session, board_id):
 
     data = schema.load(request.json)
 
-    # Get the next position
-    max_position = session.query(List).filter_by(board_id=board_uuid).count()
-    position = data.get('position', max_position)
+    # Append after the last list
+    rank, position = rank_for_append(session, List, board_uuid)
 
     new_list = List(
         list_id=uuid.uuid4(),
         board_id=board_uuid,
         title=data['title'],
-        position=position
+        rank=rank
     )
 
     session.add(new_list)
     session.flush()
+    new_list.position = position
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board_id}_lists")
+    invalidate_board(session, access.board_id)
     logger.info(f"List created: {data['title']}")
 
     list_schema = ListSchema()
@@ -69,13 +69,10 @@ def create_list(session, board_id):
         201
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'list:created', {
-            'list': list_data
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'list:created', {
+        'list': list_data
+    })
     
     return response
 
@@ -85,7 +82,7 @@ def create_list(session, board_id):
 def update_list(session, list_id):
     """Update a list"""
     schema = UpdateListSchema()
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     list_uuid, error = parse_uuid(list_id, "list ID")
     if error:
@@ -97,14 +94,18 @@ def update_list(session, list_id):
     if not list_obj:
         return not_found_response("List")
 
+    position = list_obj.position
     if 'title' in data:
         list_obj.title = data['title']
     if 'position' in data:
-        list_obj.position = data['position']
+        list_obj.rank, position = rank_for_position(
+            session, List, list_obj.board_id, data['position'], exclude_id=list_obj.list_id
+        )
 
     session.flush()
+    list_obj.position = position
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board.board_id}_lists")
+    invalidate_board(session, access.board_id)
     logger.info(f"List updated: {list_id}")
 
     list_schema = ListSchema()
@@ -115,13 +116,10 @@ def update_list(session, list_id):
         {"data": list_data}
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'list:updated', {
-            'list': list_data
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'list:updated', {
+        'list': list_data
+    })
     
     return response
 
@@ -130,7 +128,7 @@ def update_list(session, list_id):
 @board_editor_required('list', 'list_id')
 def delete_list(session, list_id):
     """Delete a list"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     list_uuid, error = parse_uuid(list_id, "list ID")
     if error:
@@ -143,18 +141,15 @@ def delete_list(session, list_id):
     session.delete(list_obj)
     session.flush()
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board.board_id}_lists")
+    invalidate_board(session, access.board_id)
     logger.info(f"List deleted: {list_id}")
 
     response = success_response("List deleted successfully")
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'list:deleted', {
-            'list_id': list_id
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'list:deleted', {
+        'list_id': list_id
+    })
 
     return response
 
@@ -163,13 +158,13 @@ def delete_list(session, list_id):
 @board_editor_required('list', 'list_id')
 def move_list(session, list_id):
     """Move a list to a new position"""
-    board = g.board  # Set by decorator
+    access = g.board_access  # Set by decorator
     
     list_uuid, error = parse_uuid(list_id, "list ID")
     if error:
         return error
 
-    data = request.json
+    data = get_request_json()
     if not data or 'new_position' not in data:
         return bad_request_response("new_position is required")
 
@@ -192,30 +187,14 @@ def move_list(session, list_id):
             {"data": list_schema.dump(list_obj)}
         )
 
-    # Shift positions
-    if new_position > old_position:
-        # Moving down - shift items up
-        lists_to_shift = session.query(List).filter(
-            List.board_id == board.board_id,
-            List.position > old_position,
-            List.position <= new_position
-        ).all()
-        for lst in lists_to_shift:
-            lst.position -= 1
-    else:
-        # Moving up - shift items down
-        lists_to_shift = session.query(List).filter(
-            List.board_id == board.board_id,
-            List.position >= new_position,
-            List.position < old_position
-        ).all()
-        for lst in lists_to_shift:
-            lst.position += 1
-
-    list_obj.position = new_position
+    # Only the moved list is written; siblings keep their ranks
+    list_obj.rank, new_position = rank_for_position(
+        session, List, access.board_id, new_position, exclude_id=list_obj.list_id
+    )
     session.flush()
+    list_obj.position = new_position
     
-    cache.delete(f"user_{g.current_user.user_id}_board_{board.board_id}_lists")
+    invalidate_board(session, access.board_id)
     logger.info(f"List moved: {list_id} to position {new_position}")
 
     list_schema = ListSchema()
@@ -226,14 +205,11 @@ def move_list(session, list_id):
         {"data": list_data}
     )
     
-    # Emit WebSocket event (safe)
-    try:
-        emit_to_board(board.board_id, 'list:moved', {
-            'list': list_data,
-            'old_position': old_position,
-            'new_position': new_position
-        })
-    except Exception as e:
-        logger.error(f"Failed to emit WebSocket event: {e}")
+    # Broadcast once the transaction commits
+    publish_board_event(session, access.board_id, 'list:moved', {
+        'list': list_data,
+        'old_position': old_position,
+        'new_position': new_position
+    })
     
     return response
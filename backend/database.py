@@ -1,29 +1,184 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, Session as OrmSession
+from sqlalchemy.pool import NullPool, QueuePool
 from config import Config
 
-# Optimized engine with connection pooling for better performance
-engine = create_engine(
-    Config.SQLALCHEMY_DATABASE_URI,
-    echo=False,  # Disable SQL echo in production for performance
-    pool_size=10,  # Number of connections to keep open
-    max_overflow=20,  # Max connections beyond pool_size
-    pool_timeout=30,  # Timeout for getting connection from pool
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_pre_ping=True,  # Verify connections before using
-    poolclass=QueuePool,
-    connect_args={
-        "connect_timeout": 10,
-        "options": "-c statement_timeout=30000"  # 30 second query timeout
-    }
-)
+
+# Called as observer(pool name, seconds waited, timed out) after every checkout
+checkout_observers = []
+
+
+class WaiterCounts:
+    """Number of checkouts currently waiting on each pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def add(self, name, amount):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def get(self, name):
+        with self._lock:
+            return self._counts.get(name, 0)
+
+
+checkout_waiters = WaiterCounts()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        checkout_waiters.add(self.logging_name, 1)
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            checkout_waiters.add(self.logging_name, -1)
+            for observer in checkout_observers:
+                observer(self.logging_name, time.perf_counter() - start, timed_out)
+
+
+def _create_engine(uri, name, pool_size, max_overflow, pool_timeout):
+    # Optimized engine with connection pooling for better performance
+    return create_engine(
+        uri,
+        echo=False,  # Disable SQL echo in production for performance
+        pool_size=pool_size,  # Number of connections to keep open
+        max_overflow=max_overflow,  # Max connections beyond pool_size
+        pool_timeout=pool_timeout,  # Timeout for getting connection from pool
+        pool_recycle=3600,  # Recycle connections after 1 hour
+        pool_pre_ping=True,  # Verify connections before using
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        connect_args={
+            "connect_timeout": 10,
+            "options": "-c statement_timeout=30000"  # 30 second query timeout
+        }
+    )
+
+
+# One pool per route class (bulkheads, Config.DB_POOLS), all on the primary.
+# utils/pools.py picks the class of each request.
+engines = {
+    name: _create_engine(Config.SQLALCHEMY_DATABASE_URI, name, **settings)
+    for name, settings in Config.DB_POOLS.items()
+}
+engine = engines["write"]  # Default for sessions without a pool class
+
+# Read replicas (DB_REPLICA_URIS). Empty means every statement goes to the primary.
+replica_engines = [
+    _create_engine(uri, f"replica{index}", **Config.DB_POOLS["read"])
+    for index, uri in enumerate(Config.DB_REPLICA_URIS)
+]
+
+
+class LaggedSnapshots:
+    """
+    Makes a stand-in replica on the primary's own URL lag like a real one
+    (DB_REPLICA_LAG). A thread exports a snapshot of the primary every
+    lag / STEPS seconds, each held open by a transaction on a connection
+    of its own, and every transaction on the replica imports the newest
+    snapshot that is at least `lag` seconds old.
+    """
+    STEPS = 10
+
+    def __init__(self, url, lag):
+        self._exporter = create_engine(url, poolclass=NullPool)
+        self._lag = lag
+        self._lock = threading.Lock()
+        self._snapshots = deque()  # (taken, holding DBAPI connection, snapshot id), oldest first
+        self._export()
+        threading.Thread(target=self._run, name="lagged-snapshots", daemon=True).start()
+
+    def _export(self):
+        holder = self._exporter.raw_connection()
+        cursor = holder.cursor()
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        cursor.execute("SELECT pg_export_snapshot()")
+        snapshot = cursor.fetchone()[0]
+        cursor.close()
+        with self._lock:
+            self._snapshots.append((time.monotonic(), holder, snapshot))
+            # Drop the snapshots older than the newest one that is old enough
+            while len(self._snapshots) > 1 and time.monotonic() - self._snapshots[1][0] >= self._lag:
+                self._snapshots.popleft()[1].close()
+
+    def _run(self):
+        while True:
+            time.sleep(self._lag / self.STEPS)
+            self._export()
+
+    def begin(self, connection):
+        # Under the lock: a snapshot can only be imported while its holder is open
+        with self._lock:
+            cursor = connection.connection.cursor()
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cursor.execute(f"SET TRANSACTION SNAPSHOT '{self._snapshots[0][2]}'")
+            cursor.close()
+
+
+if Config.DB_REPLICA_LAG:
+    for replica in replica_engines:
+        event.listen(replica, "begin", LaggedSnapshots(replica.url, Config.DB_REPLICA_LAG).begin)
+
 
 Base = declarative_base()
 
-Session = sessionmaker(bind=engine, expire_on_commit=False)
+_primary_reads = ContextVar("primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Run every statement issued inside the block on the primary."""
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class RoutingSession(OrmSession):
+    """
+    Session that runs its statements on one replica when marked with
+    info["use_replica"] (see utils/replicas.py), and on the primary
+    otherwise, through the pool named by info["pool"]. Flushes and
+    primary_reads() blocks always use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("use_replica") and not self._flushing and not _primary_reads.get():
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = random.choice(replica_engines)
+            return replica
+        return engines.get(self.info.get("pool"), engine)
 
 
+Session = sessionmaker(class_=RoutingSession, bind=engine, expire_on_commit=False)
 
+# One session per request or Socket.IO event, shared by auth, the access
+# decorators and the controllers. Like any Session it only checks out a pool
+# connection when it runs its first statement, so requests answered from
+# cache never touch the pool. Only use it inside an app context.
+db_session = scoped_session(Session)
 
 
+def init_db_session(app):
+    """Remove the request's session when its app context ends."""
+    @app.teardown_appcontext
+    def remove_db_session(exc=None):
+        db_session.remove()
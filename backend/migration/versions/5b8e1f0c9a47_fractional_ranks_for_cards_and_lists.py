@@ -0,0 +1,65 @@
+"""fractional ranks for cards and lists
+
+Revision ID: 5b8e1f0c9a47
+Revises: 2e7dffff41f4
+Create Date: 2026-10-17 09:12:31.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1f0c9a47'
+down_revision: Union[str, Sequence[str], None] = '2e7dffff41f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, primary key, ordering scope)
+RANKED_TABLES = (
+    ('cards', 'card_id', 'list_id'),
+    ('lists', 'list_id', 'board_id'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, pk, scope in RANKED_TABLES:
+        op.add_column(table, sa.Column('rank', sa.String(length=64, collation='C'), nullable=True))
+
+        # Fixed-width decimal keys are valid base-62 ranks; the 'V' suffix
+        # keeps them from ending in '0' (see utils/ranking.py)
+        op.execute(f"""
+            UPDATE {table} SET rank = ranked.rank
+            FROM (
+                SELECT {pk},
+                       lpad(row_number() OVER (PARTITION BY {scope} ORDER BY position, {pk})::text, 8, '0') || 'V' AS rank
+                FROM {table}
+            ) AS ranked
+            WHERE {table}.{pk} = ranked.{pk}
+        """)
+
+        op.alter_column(table, 'rank', nullable=False)
+        op.drop_column(table, 'position')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, pk, scope in RANKED_TABLES:
+        op.add_column(table, sa.Column('position', sa.Integer(), nullable=True))
+
+        op.execute(f"""
+            UPDATE {table} SET position = ranked.position
+            FROM (
+                SELECT {pk},
+                       row_number() OVER (PARTITION BY {scope} ORDER BY rank, {pk}) - 1 AS position
+                FROM {table}
+            ) AS ranked
+            WHERE {table}.{pk} = ranked.{pk}
+        """)
+
+        op.alter_column(table, 'position', nullable=False)
+        op.drop_column(table, 'rank')
@@ -0,0 +1,67 @@
+"""add foreign key and ordering indexes
+
+Revision ID: 7c3d92a4e6b1
+Revises: 5b8e1f0c9a47
+Create Date: 2026-10-17 11:40:08.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3d92a4e6b1'
+down_revision: Union[str, Sequence[str], None] = '5b8e1f0c9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index, table, columns)
+INDEXES = (
+    ('idx_lists_board_rank', 'lists', ['board_id', 'rank']),
+    ('idx_cards_list_rank', 'cards', ['list_id', 'rank']),
+    ('idx_comments_card_created', 'comments', ['card_id', 'created_at']),
+    ('idx_comments_user', 'comments', ['user_id']),
+    ('idx_board_members_board_user', 'board_members', ['board_id', 'user_id']),
+    ('idx_board_members_user', 'board_members', ['user_id']),
+    ('idx_card_assignees_card', 'card_assignees', ['card_id']),
+    ('idx_card_assignees_user', 'card_assignees', ['user_id']),
+    ('idx_card_labels_card', 'card_labels', ['card_id']),
+    ('idx_card_labels_label', 'card_labels', ['label_id']),
+    ('idx_labels_board', 'labels', ['board_id']),
+    ('idx_boards_owner', 'boards', ['owner_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+        # Duplicates the unique ix_users_email
+        op.drop_index(
+            'idx_user_email', table_name='users',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_user_email', 'users', ['email'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,69 @@
+"""unique membership, label and assignee pairs
+
+Revision ID: 9a1f4c7e2d58
+Revises: 7c3d92a4e6b1
+Create Date: 2026-10-17 13:05:52.904716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1f4c7e2d58'
+down_revision: Union[str, Sequence[str], None] = '7c3d92a4e6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (constraint, table, pair, primary key, order of the row to keep,
+#  index made redundant by the constraint, its columns)
+UNIQUE_PAIRS = (
+    ('uq_board_members_board_user', 'board_members', ('board_id', 'user_id'), 'member_id',
+     'role', 'idx_board_members_board_user', ['board_id', 'user_id']),
+    ('uq_card_assignees_card_user', 'card_assignees', ('card_id', 'user_id'), 'id',
+     'id', 'idx_card_assignees_card', ['card_id']),
+    ('uq_card_labels_card_label', 'card_labels', ('card_id', 'label_id'), 'id',
+     'id', 'idx_card_labels_card', ['card_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for _, table, (a, b), pk, keep_order, _, _ in UNIQUE_PAIRS:
+        # Keep one row per pair; for members the enum order keeps the
+        # highest role (ADMIN < EDITOR < VIEWER)
+        op.execute(f"""
+            DELETE FROM {table}
+            USING (
+                SELECT {pk},
+                       row_number() OVER (PARTITION BY {a}, {b} ORDER BY {keep_order}, {pk}) AS n
+                FROM {table}
+            ) AS ranked
+            WHERE {table}.{pk} = ranked.{pk} AND ranked.n > 1
+        """)
+
+    with op.get_context().autocommit_block():
+        for name, table, pair, _, _, redundant_index, _ in UNIQUE_PAIRS:
+            op.create_index(
+                name, table, list(pair), unique=True,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+            op.drop_index(
+                redundant_index, table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _, _, redundant_index, columns in reversed(UNIQUE_PAIRS):
+            op.create_index(
+                redundant_index, table, columns,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+            op.drop_constraint(name, table, type_='unique')
@@ -0,0 +1,63 @@
+"""cascade deletes from boards, lists and cards
+
+Revision ID: b4e8d2f61c03
+Revises: 9a1f4c7e2d58
+Create Date: 2026-10-17 14:21:37.660194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d2f61c03'
+down_revision: Union[str, Sequence[str], None] = '9a1f4c7e2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referenced table, referenced column); the constraints
+# keep PostgreSQL's default <table>_<column>_fkey names
+CASCADING_KEYS = (
+    ('board_members', 'board_id', 'boards', 'board_id'),
+    ('labels', 'board_id', 'boards', 'board_id'),
+    ('lists', 'board_id', 'boards', 'board_id'),
+    ('cards', 'list_id', 'lists', 'list_id'),
+    ('comments', 'card_id', 'cards', 'card_id'),
+    ('card_assignees', 'card_id', 'cards', 'card_id'),
+    ('card_labels', 'card_id', 'cards', 'card_id'),
+    ('card_labels', 'label_id', 'labels', 'label_id'),
+)
+
+
+def _replace_foreign_keys(on_delete):
+    # NOT VALID skips the full-table check while the ALTERs hold their
+    # ACCESS EXCLUSIVE locks, which last until the migration transaction
+    # commits
+    for table, column, referenced_table, referenced_column in CASCADING_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.execute(f"""
+            ALTER TABLE {table}
+                DROP CONSTRAINT {name},
+                ADD CONSTRAINT {name} FOREIGN KEY ({column})
+                    REFERENCES {referenced_table} ({referenced_column}) {on_delete} NOT VALID
+        """)
+
+    # Validate after that commit, each in its own transaction: VALIDATE only
+    # takes a SHARE UPDATE EXCLUSIVE lock, so reads and writes continue
+    # during the scan
+    with op.get_context().autocommit_block():
+        for table, column, _, _ in CASCADING_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_foreign_keys('ON DELETE CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys('')
@@ -0,0 +1,28 @@
+"""add version to cards
+
+Revision ID: c7a5e19d3b20
+Revises: b4e8d2f61c03
+Create Date: 2026-10-17 16:02:44.318752
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a5e19d3b20'
+down_revision: Union[str, Sequence[str], None] = 'b4e8d2f61c03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cards', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cards', 'version')
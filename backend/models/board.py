@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 from database import Base
 
 
@@ -14,6 +14,13 @@ class Board(Base):
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
 
     owner = relationship("User", back_populates="boards_owned")
-    members = relationship("BoardMember", back_populates="board", cascade="all, delete-orphan")
-    lists = relationship("List", back_populates="board", cascade="all, delete-orphan")
-    labels = relationship("Label", back_populates="board", cascade="all, delete-orphan")
+    members = relationship("BoardMember", back_populates="board", cascade="all, delete-orphan", passive_deletes=True)
+    lists = relationship("List", back_populates="board", cascade="all, delete-orphan", passive_deletes=True)
+    labels = relationship("Label", back_populates="board", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("idx_boards_owner", "owner_id"),
+    )
+
+    # Only populated by listings that ask for counts instead of member arrays
+    member_count = query_expression()
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, Enum, ForeignKey
+from sqlalchemy import Column, Enum, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database import Base
@@ -11,10 +11,15 @@ class BoardMember(Base):
 
     member_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    board_id = Column(UUID(as_uuid=True), ForeignKey("boards.board_id"), nullable=False)
+    board_id = Column(UUID(as_uuid=True), ForeignKey("boards.board_id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
 
     role = Column(Enum(BoardRole, name="board_roles"), nullable=False, default=BoardRole.VIEWER)
 
     board = relationship("Board", back_populates="members")
     user = relationship("User", back_populates="board_memberships")
+
+    __table_args__ = (
+        UniqueConstraint("board_id", "user_id", name="uq_board_members_board_user"),
+        Index("idx_board_members_user", "user_id"),
+    )
@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, Text, Date, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Date, Integer, ForeignKey, select, func, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 from database import Base
 
 
@@ -12,11 +12,35 @@ class Card(Base):
     title = Column(String(150), nullable=False)
     description = Column(Text)
     due_date = Column(Date)
-    position = Column(Integer, nullable=False)
+    rank = Column(String(64, collation="C"), nullable=False)  # fractional ordering key, see utils/ranking.py
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # see __mapper_args__
 
-    list_id = Column(UUID(as_uuid=True), ForeignKey("lists.list_id"), nullable=False)
+    list_id = Column(UUID(as_uuid=True), ForeignKey("lists.list_id", ondelete="CASCADE"), nullable=False)
 
     list = relationship("List", back_populates="cards")
-    comments = relationship("Comment", back_populates="card", cascade="all, delete-orphan")
-    assignees = relationship("CardAssignee", back_populates="card", cascade="all, delete-orphan")
-    labels = relationship("CardLabel", back_populates="card", cascade="all, delete-orphan")
+    comments = relationship("Comment", back_populates="card", cascade="all, delete-orphan", passive_deletes=True)
+    assignees = relationship("CardAssignee", back_populates="card", cascade="all, delete-orphan", passive_deletes=True)
+    labels = relationship("CardLabel", back_populates="card", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("idx_cards_list_rank", "list_id", "rank"),
+    )
+
+    # Every UPDATE writes the next version and matches the row on the version
+    # it loaded, so two concurrent writers never produce the same version:
+    # the second one gets StaleDataError (409 from with_db_session)
+    __mapper_args__ = {"version_id_col": version}
+
+
+# Zero-based position within the list, derived from rank order. Bulk reads
+# override this with a window function (utils.ranking.position_expression).
+_table = Card.__table__
+_sibling = _table.alias("sibling_cards")
+Card.position = query_expression(
+    select(func.count())
+    .select_from(_sibling)
+    .where(_sibling.c.list_id == _table.c.list_id, _sibling.c.rank < _table.c.rank)
+    .correlate_except(_sibling)
+    .scalar_subquery()
+)
+
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database import Base
@@ -8,9 +8,14 @@ class CardAssignee(Base):
     __tablename__ = "card_assignees"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
-    card_id = Column(UUID(as_uuid=True), ForeignKey("cards.card_id"), nullable=False)
+    card_id = Column(UUID(as_uuid=True), ForeignKey("cards.card_id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
 
     # Relationships
     card = relationship("Card", back_populates="assignees")
     user = relationship("User", back_populates="assigned_cards")
+
+    __table_args__ = (
+        UniqueConstraint("card_id", "user_id", name="uq_card_assignees_card_user"),
+        Index("idx_card_assignees_user", "user_id"),
+    )
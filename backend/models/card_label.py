@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database import Base
@@ -10,8 +10,13 @@ class CardLabel(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    card_id = Column(UUID(as_uuid=True), ForeignKey("cards.card_id"), nullable=False)
-    label_id = Column(UUID(as_uuid=True), ForeignKey("labels.label_id"), nullable=False)
+    card_id = Column(UUID(as_uuid=True), ForeignKey("cards.card_id", ondelete="CASCADE"), nullable=False)
+    label_id = Column(UUID(as_uuid=True), ForeignKey("labels.label_id", ondelete="CASCADE"), nullable=False)
 
     card = relationship("Card", back_populates="labels")
     label = relationship("Label", back_populates="cards")
+
+    __table_args__ = (
+        UniqueConstraint("card_id", "label_id", name="uq_card_labels_card_label"),
+        Index("idx_card_labels_label", "label_id"),
+    )
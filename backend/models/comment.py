@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Text, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -13,8 +13,13 @@ class Comment(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    card_id = Column(UUID(as_uuid=True), ForeignKey("cards.card_id"), nullable=False)
+    card_id = Column(UUID(as_uuid=True), ForeignKey("cards.card_id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
 
     card = relationship("Card", back_populates="comments")
     user = relationship("User", back_populates="comments")
+
+    __table_args__ = (
+        Index("idx_comments_card_created", "card_id", "created_at"),
+        Index("idx_comments_user", "user_id"),
+    )
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database import Base
@@ -12,7 +12,11 @@ class Label(Base):
     name = Column(String(50), nullable=False)
     color = Column(String(20), nullable=False)
 
-    board_id = Column(UUID(as_uuid=True), ForeignKey("boards.board_id"), nullable=False)
+    board_id = Column(UUID(as_uuid=True), ForeignKey("boards.board_id", ondelete="CASCADE"), nullable=False)
 
     board = relationship("Board", back_populates="labels")
-    cards = relationship("CardLabel", back_populates="label")
+    cards = relationship("CardLabel", back_populates="label", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("idx_labels_board", "board_id"),
+    )
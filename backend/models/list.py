@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, select, func, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 from database import Base
 
 
@@ -11,9 +11,26 @@ class List(Base):
     list_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(100), nullable=False)
 
-    position = Column(Integer, nullable=False)  # ordering
+    rank = Column(String(64, collation="C"), nullable=False)  # ordering, see utils/ranking.py
 
-    board_id = Column(UUID(as_uuid=True), ForeignKey("boards.board_id"), nullable=False)
+    board_id = Column(UUID(as_uuid=True), ForeignKey("boards.board_id", ondelete="CASCADE"), nullable=False)
 
     board = relationship("Board", back_populates="lists")
-    cards = relationship("Card", back_populates="list", cascade="all, delete-orphan")
+    cards = relationship("Card", back_populates="list", cascade="all, delete-orphan", passive_deletes=True, order_by="Card.rank")
+
+    __table_args__ = (
+        Index("idx_lists_board_rank", "board_id", "rank"),
+    )
+
+
+# Zero-based position within the board, derived from rank order. Bulk reads
+# override this with a window function (utils.ranking.position_expression).
+_table = List.__table__
+_sibling = _table.alias("sibling_lists")
+List.position = query_expression(
+    select(func.count())
+    .select_from(_sibling)
+    .where(_sibling.c.board_id == _table.c.board_id, _sibling.c.rank < _table.c.rank)
+    .correlate_except(_sibling)
+    .scalar_subquery()
+)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Enum, Index
+from sqlalchemy import Column, String, Enum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -21,10 +21,6 @@ class User(Base):
     comments = relationship("Comment", back_populates="user")
     assigned_cards = relationship("CardAssignee", back_populates="user")
 
-    __table_args__ = (
-        Index("idx_user_email", "email"),
-    )
-
     def set_password(self, password):
         self.password = generate_password_hash(password)
 
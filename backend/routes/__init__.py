@@ -4,5 +4,9 @@ from routes.list_routes import list_bp
 from routes.card_routes import card_bp
 from routes.label_routes import label_bp
 from routes.comment_routes import comment_bp
+from routes.metrics_routes import metrics_bp
 
-__all__ = ['auth_bp', 'board_bp', 'list_bp', 'card_bp', 'label_bp', 'comment_bp']
+# Registers the Socket.IO mutation events
+import routes.socket_routes  # noqa: F401
+
+__all__ = ['auth_bp', 'board_bp', 'list_bp', 'card_bp', 'label_bp', 'comment_bp', 'metrics_bp']
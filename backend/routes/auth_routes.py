@@ -1,17 +1,21 @@
 from flask import Blueprint, request, jsonify, g
 from controllers import signup, login
-from utils import token_required, limiter, cache
+from utils import token_required, limiter, cache, db_pool, priority
 from flask_limiter.util import get_remote_address
 
 auth_bp = Blueprint('auth', __name__)
 
 
 @auth_bp.route('/auth/signup', methods=['POST'])
+@db_pool('auth')
+@priority('critical')
 def signup_route():
     return signup()
 
 
 @auth_bp.route('/auth/login', methods=['POST'])
 @limiter.exempt
+@db_pool('auth')
+@priority('critical')
 def login_route():
     return login()
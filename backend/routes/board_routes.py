@@ -1,12 +1,15 @@
 from flask import Blueprint
 from utils.auth import token_required
-from controllers.board_controller import get_boards, create_board, update_board, delete_board
+from utils.pools import db_pool
+from utils.admission import priority
+from controllers.board_controller import get_boards, get_board_snapshot, get_board_presence, stream_board_events, create_board, update_board, delete_board
 from controllers.board_member_controller import invite_member, get_board_members, update_member_role, remove_member
 
 board_bp = Blueprint('board', __name__)
 
 
 @board_bp.route('/boards', methods=['GET'])
+@priority('low')
 @token_required
 def get_all_boards():
     return get_boards()
@@ -30,6 +33,26 @@ def delete_existing_board(board_id):
     return delete_board(board_id=board_id)
 
 
+@board_bp.route('/boards/<board_id>/snapshot', methods=['GET'])
+@db_pool('heavy')
+@token_required
+def get_snapshot(board_id):
+    return get_board_snapshot(board_id=board_id)
+
+
+@board_bp.route('/boards/<board_id>/presence', methods=['GET'])
+@token_required
+def get_presence(board_id):
+    return get_board_presence(board_id=board_id)
+
+
+@board_bp.route('/boards/<board_id>/events', methods=['GET'])
+@priority('low')
+@token_required
+def get_events(board_id):
+    return stream_board_events(board_id=board_id)
+
+
 @board_bp.route('/boards/<board_id>/invite', methods=['POST'])
 @token_required
 def invite_board_member(board_id):
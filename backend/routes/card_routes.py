@@ -1,5 +1,6 @@
 from flask import Blueprint
 from utils.auth import token_required
+from utils.admission import priority
 from controllers.card_controller import (
     get_cards,
     create_card,
@@ -38,6 +39,7 @@ def delete_list_card(card_id):
 
 
 @card_bp.route('/cards/<card_id>/move', methods=['PUT'])
+@priority('critical')
 @token_required
 def move_list_card(card_id):
     return move_card(card_id=card_id)
@@ -1,5 +1,6 @@
 from flask import Blueprint
 from utils.auth import token_required
+from utils.admission import priority
 from controllers.comment_controller import (
     get_card_comments,
     create_comment,
@@ -10,6 +11,7 @@ comment_bp = Blueprint('comment', __name__)
 
 
 @comment_bp.route('/cards/<card_id>/comments', methods=['GET'])
+@priority('low')
 @token_required
 def get_comments(card_id):
     return get_card_comments(card_id=card_id)
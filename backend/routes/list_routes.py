@@ -1,5 +1,6 @@
 from flask import Blueprint
 from utils.auth import token_required
+from utils.admission import priority
 from controllers.list_controller import get_lists, create_list, update_list, delete_list, move_list
 
 list_bp = Blueprint('list', __name__)
@@ -30,6 +31,7 @@ def delete_board_list(list_id):
 
 
 @list_bp.route('/lists/<list_id>/move', methods=['PUT'])
+@priority('critical')
 @token_required
 def move_board_list(list_id):
     return move_list(list_id=list_id)
@@ -0,0 +1,24 @@
+import hmac
+from flask import Blueprint, jsonify, request
+from config import Config
+from utils import limiter
+from utils.metrics import collect_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _metrics_token_valid():
+    """Check the request's bearer token against Config.METRICS_TOKEN."""
+    if not Config.METRICS_TOKEN:
+        return False
+    expected = f"Bearer {Config.METRICS_TOKEN}"
+    return hmac.compare_digest(request.headers.get("Authorization", ""), expected)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+@limiter.exempt
+def get_metrics():
+    """Internal counters, for scrapers holding METRICS_TOKEN only."""
+    if not _metrics_token_valid():
+        return jsonify({"message": "Not found"}), 404
+    return jsonify(collect_metrics())
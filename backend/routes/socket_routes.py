@@ -0,0 +1,48 @@
+"""
+Board mutations over the Socket.IO connection.
+
+The events run the same controllers as the REST routes, authenticated by
+the socket session instead of a token per request. The controller's
+response is sent back as the ack: (body, status code). Changes are
+broadcast to the board room as usual once they commit.
+"""
+from flask import current_app, g, request
+from database import db_session
+from utils.websocket import socketio, authenticated_only
+from utils.replicas import route_session
+from controllers.card_controller import update_card, move_card
+from controllers.list_controller import move_list
+
+
+def _run_controller(controller, id_field, data):
+    """Run a REST controller with the event data as its body."""
+    if not isinstance(data, dict) or not data.get(id_field):
+        return {'message': f"{id_field} is required"}, 400
+
+    g.current_user = request.current_user
+    route_session(db_session(), g.current_user.user_id, read_only=False)
+    g.socket_payload = {key: value for key, value in data.items() if key != id_field}
+
+    response = current_app.make_response(controller(**{id_field: data[id_field]}))
+    return response.get_json(), response.status_code
+
+
+@socketio.on('card:move')
+@authenticated_only
+def socket_move_card(data):
+    """Same as PUT /cards/<card_id>/move: {card_id, new_list_id, new_position}"""
+    return _run_controller(move_card, 'card_id', data)
+
+
+@socketio.on('card:update')
+@authenticated_only
+def socket_update_card(data):
+    """Same as PUT /cards/<card_id>: {card_id, ...fields}"""
+    return _run_controller(update_card, 'card_id', data)
+
+
+@socketio.on('list:move')
+@authenticated_only
+def socket_move_list(data):
+    """Same as PUT /lists/<list_id>/move: {list_id, new_position}"""
+    return _run_controller(move_list, 'list_id', data)
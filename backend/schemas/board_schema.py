@@ -50,6 +50,16 @@ class BoardSchema(Schema):
         ordered = True
 
 
+class BoardSummarySchema(BoardSchema):
+    """Board listing entry with a member count instead of the member array."""
+    member_count = fields.Int(dump_only=True)
+
+    class Meta:
+        unknown = EXCLUDE
+        ordered = True
+        exclude = ("members",)
+
+
 class CreateBoardSchema(Schema):
     name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     
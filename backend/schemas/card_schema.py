@@ -22,6 +22,7 @@ class CardSchema(Schema):
     description = fields.Str(allow_none=True)
     due_date = fields.Date(allow_none=True)
     position = fields.Int(dump_only=True)
+    version = fields.Int(dump_only=True)
     labels = fields.List(fields.Nested(CardLabelSchema), dump_only=True)
     assignees = fields.List(fields.Nested(CardAssigneeSchema), dump_only=True)
 
@@ -1,4 +1,5 @@
 from marshmallow import Schema, fields, validate
+from schemas.card_schema import CardSchema
 
 class ListSchema(Schema):
     list_id = fields.UUID(dump_only=True)
@@ -6,6 +7,9 @@ class ListSchema(Schema):
     title = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     position = fields.Int(dump_only=True)
 
+class ListWithCardsSchema(ListSchema):
+    cards = fields.List(fields.Nested(CardSchema), dump_only=True)
+
 class CreateListSchema(Schema):
     title = fields.Str(required=True, validate=validate.Length(min=1, max=100))
 
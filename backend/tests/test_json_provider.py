@@ -0,0 +1,54 @@
+"""
+OrjsonProvider must send the same bytes as Flask's default provider,
+re-encoding with the stdlib whatever orjson would write differently.
+"""
+import dataclasses
+import datetime
+import uuid
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+pytest.importorskip("orjson")
+
+from utils.json_provider import OrjsonProvider
+
+
+@dataclasses.dataclass
+class Sample:
+    name: str
+    ratio: float
+
+
+PAYLOADS = {
+    "board": {
+        "message": "ok",
+        "data": [{"card_id": uuid.UUID(int=i), "title": f"card {i}", "due_date": datetime.date(2026, 1, i + 1),
+                  "position": i, "labels": [], "description": None} for i in range(3)],
+    },
+    "non_ascii": {"title": "naïve ✓", "description": "del \x7f"},
+    "big_int": {"n": 2 ** 70},
+    "non_string_keys": {1: "a", 2: "b"},
+    "safe_floats": {"values": [0.0, -0.0, 1e-4, 0.5, 123.456, 9999999999999998.0, 1 / 3]},
+    "nan": {"value": float("nan")},
+    "infinity": {"values": [float("inf"), float("-inf")]},
+    "large_float": {"value": 1e16},
+    "small_float": {"values": (0.00001, -2.5e-7)},
+    "float_in_dataclass": {"sample": Sample("x", 1e20)},
+    "datetime": {"at": datetime.datetime(2026, 10, 17, 6, 30, tzinfo=datetime.timezone.utc)},
+}
+
+
+@pytest.fixture(params=[False, True], ids=["compact", "debug"])
+def app(request):
+    app = Flask(__name__)
+    app.debug = request.param
+    return app
+
+
+@pytest.mark.parametrize("name", PAYLOADS)
+def test_same_bytes_as_default_provider(name, app):
+    payload = PAYLOADS[name]
+    with app.app_context():
+        expected = DefaultJSONProvider(app).response(payload).get_data()
+        assert OrjsonProvider(app).response(payload).get_data() == expected
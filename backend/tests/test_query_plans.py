@@ -0,0 +1,164 @@
+"""
+Query plan regression tests for the hot read paths.
+
+Seeds a Postgres database large enough for the planner to prefer indexes,
+runs each hot query in utils/helpers.py and utils/acl.py, and EXPLAINs every
+statement it sent. A sequential scan of any table means an index (migration
+7c3d92a4e6b1, or a primary key) is missing or no longer matches the query.
+
+Needs a throwaway database: set TEST_DATABASE_URL, whose tables are dropped
+and recreated. Skipped otherwise.
+"""
+import os
+import uuid
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from database import Base
+from models import Board, BoardMember, Card, CardAssignee, CardLabel, Comment, Label, List, User
+from models.enums import BoardRole
+from utils.acl import load_board_acl, resolve_board_access
+from utils.helpers import (
+    get_board_with_relations, get_boards_for_user, get_card_rows, get_card_with_relations,
+    get_comments_by_card, get_labels_by_board, get_list_rows_with_cards, get_lists_by_board,
+)
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+USERS = 20000
+BOARDS = 1000
+# Boards without lists, so boards is as large as a real one next to users:
+# with a few thousand rows a hash join over the whole table is cheaper
+# than index lookups, and every such join would show up as a Seq Scan
+EMPTY_BOARDS = 19000
+MEMBERS_PER_BOARD = 5
+LISTS_PER_BOARD = 8
+CARDS_PER_LIST = 15
+LABELS_PER_BOARD = 4
+
+
+def _seed(connection):
+    users = [uuid.uuid4() for _ in range(USERS)]
+    connection.execute(insert(User), [
+        {"user_id": user_id, "name": f"user {i}", "email": f"user{i}@example.com", "password": "x"}
+        for i, user_id in enumerate(users)
+    ])
+
+    boards, members, lists, cards, labels, card_labels, assignees, comments = [], [], [], [], [], [], [], []
+    for b in range(BOARDS):
+        board_id = uuid.uuid4()
+        boards.append({"board_id": board_id, "name": f"board {b}", "owner_id": users[b % USERS]})
+        board_users = [users[(b * 7 + m + 1) % USERS] for m in range(MEMBERS_PER_BOARD)]
+        members += [
+            {"member_id": uuid.uuid4(), "board_id": board_id, "user_id": user_id, "role": BoardRole.EDITOR}
+            for user_id in board_users
+        ]
+        board_labels = [uuid.uuid4() for _ in range(LABELS_PER_BOARD)]
+        labels += [
+            {"label_id": label_id, "board_id": board_id, "name": f"label {i}", "color": "red"}
+            for i, label_id in enumerate(board_labels)
+        ]
+        for l in range(LISTS_PER_BOARD):
+            list_id = uuid.uuid4()
+            lists.append({"list_id": list_id, "board_id": board_id, "title": f"list {l}", "rank": f"{l:04d}"})
+            for c in range(CARDS_PER_LIST):
+                card_id = uuid.uuid4()
+                cards.append({"card_id": card_id, "list_id": list_id, "title": f"card {c}", "rank": f"{c:04d}"})
+                if c % 2 == 0:
+                    card_labels.append({"id": uuid.uuid4(), "card_id": card_id, "label_id": board_labels[c % LABELS_PER_BOARD]})
+                if c % 3 == 0:
+                    assignees.append({"id": uuid.uuid4(), "card_id": card_id, "user_id": board_users[c % MEMBERS_PER_BOARD]})
+                if c % 5 == 0:
+                    comments.append({"comment_id": uuid.uuid4(), "card_id": card_id, "user_id": board_users[0], "content": "x"})
+
+    boards += [
+        {"board_id": uuid.uuid4(), "name": f"empty board {b}", "owner_id": users[b % USERS]}
+        for b in range(BOARDS, BOARDS + EMPTY_BOARDS)
+    ]
+
+    for model, rows in (
+        (Board, boards), (BoardMember, members), (Label, labels), (List, lists), (Card, cards),
+        (CardLabel, card_labels), (CardAssignee, assignees), (Comment, comments),
+    ):
+        connection.execute(insert(model), rows)
+
+    return {"user_id": members[0]["user_id"], "board_id": boards[0]["board_id"],
+            "list_id": lists[0]["list_id"], "card_id": cards[0]["card_id"], "label_id": labels[0]["label_id"]}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        engine.seeded = _seed(connection)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("ANALYZE")
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def explain(engine):
+    """Run a callable with a session and return the plans of the SELECTs it sent."""
+    def run(query):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            with Session(engine) as session:
+                query(session)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert statements, "the query sent no SELECT"
+        with engine.connect() as connection:
+            return [
+                connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"]
+                for statement, parameters in statements
+            ]
+    return run
+
+
+def _seq_scans(plan):
+    """Relations read by a Seq Scan anywhere in a plan tree."""
+    found = set()
+    if plan["Node Type"] == "Seq Scan":
+        found.add(plan["Relation Name"])
+    for child in plan.get("Plans", ()):
+        found |= _seq_scans(child)
+    return found
+
+
+HOT_QUERIES = {
+    "boards_for_user": lambda s, ids: get_boards_for_user(s, ids["user_id"]),
+    "boards_for_user_page": lambda s, ids: get_boards_for_user(
+        s, ids["user_id"], limit=20, after=("", uuid.UUID(int=0)), include_members=False),
+    "board_with_relations": lambda s, ids: get_board_with_relations(s, ids["board_id"]),
+    "lists_by_board": lambda s, ids: get_lists_by_board(s, ids["board_id"]),
+    "list_rows_with_cards": lambda s, ids: get_list_rows_with_cards(s, ids["board_id"]),
+    "card_rows": lambda s, ids: get_card_rows(s, [ids["list_id"]]),
+    "card_with_relations": lambda s, ids: get_card_with_relations(s, ids["card_id"]),
+    "labels_by_board": lambda s, ids: get_labels_by_board(s, ids["board_id"]),
+    "comments_by_card": lambda s, ids: get_comments_by_card(s, ids["card_id"]),
+    "board_acl": lambda s, ids: load_board_acl(s, ids["board_id"]),
+    "access_via_list": lambda s, ids: resolve_board_access(s, "list", ids["list_id"], ids["user_id"]),
+    "access_via_card": lambda s, ids: resolve_board_access(s, "card", ids["card_id"], ids["user_id"]),
+    "access_via_label": lambda s, ids: resolve_board_access(s, "label", ids["label_id"], ids["user_id"]),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_indexes(name, engine, explain):
+    plans = explain(lambda session: HOT_QUERIES[name](session, engine.seeded))
+    scanned = set().union(*(_seq_scans(plan) for plan in plans))
+    assert not scanned, f"{name} scans {sorted(scanned)} sequentially"
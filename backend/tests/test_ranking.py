@@ -0,0 +1,81 @@
+"""
+Rank rebalancing on a versioned table.
+
+Moves a card into a gap that leaves no room for a new key: between
+adjacent ranks, whose midpoint is longer than MAX_RANK_LENGTH, and between
+duplicate ranks, such as concurrent appends leave. Both make
+rank_for_position rebalance the list before placing the card.
+
+Needs a throwaway database: set TEST_DATABASE_URL, whose tables are dropped
+and recreated. Skipped otherwise.
+"""
+import os
+import uuid
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database import Base
+from models import Board, Card, List, User
+from utils.ranking import MAX_RANK_LENGTH, rank_for_position
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+# Ranks of the cards already in the list, in order
+CROWDED_RANKS = {
+    "adjacent": ["V", "V" + "0" * (MAX_RANK_LENGTH - 1) + "1", "W", "X"],
+    "duplicate": ["V", "V", "V", "X"],
+}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _seed_list(engine, ranks):
+    """A list holding one card per rank, plus one card to move; returns (list id, card ids, moved card id)."""
+    user_id, board_id, list_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    card_ids = [uuid.uuid4() for _ in ranks]
+    moved_id = uuid.uuid4()
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"user_id": user_id, "name": "user", "email": f"{user_id}@example.com", "password": "x"}])
+        connection.execute(insert(Board), [{"board_id": board_id, "name": "board", "owner_id": user_id}])
+        connection.execute(insert(List), [{"list_id": list_id, "board_id": board_id, "title": "list", "rank": "V"}])
+        connection.execute(insert(Card), [
+            {"card_id": card_id, "list_id": list_id, "title": f"card {i}", "rank": rank}
+            for i, (card_id, rank) in enumerate(zip(card_ids, ranks))
+        ] + [{"card_id": moved_id, "list_id": list_id, "title": "moved", "rank": "z"}])
+    return list_id, card_ids, moved_id
+
+
+@pytest.mark.parametrize("crowding", CROWDED_RANKS)
+def test_move_into_crowded_gap_rebalances(crowding, engine):
+    list_id, card_ids, moved_id = _seed_list(engine, CROWDED_RANKS[crowding])
+
+    # As move_card does: rank the card between the first two siblings
+    with Session(engine) as session:
+        card = session.get(Card, moved_id)
+        card.rank, position = rank_for_position(session, Card, list_id, 1, exclude_id=moved_id)
+        session.commit()
+
+    assert position == 1
+    with Session(engine) as session:
+        rows = session.execute(
+            select(Card.card_id, Card.rank, Card.version).where(Card.list_id == list_id).order_by(Card.rank)
+        ).all()
+
+    # rebalance orders duplicate ranks by card ID
+    siblings = [card_id for _, card_id in sorted(zip(CROWDED_RANKS[crowding], card_ids))]
+    assert [row.card_id for row in rows] == [siblings[0], moved_id, *siblings[1:]]
+    assert len({row.rank for row in rows}) == len(rows), "ranks are not unique after the rebalance"
+    assert all(len(row.rank) <= MAX_RANK_LENGTH for row in rows)
+    # Only the moved card changed as far as clients can tell
+    assert {row.card_id: row.version for row in rows} == {**{card_id: 1 for card_id in card_ids}, moved_id: 2}
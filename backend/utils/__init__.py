@@ -1,59 +1,87 @@
 from utils.auth import token_required
-from utils.cache import cache, init_cache
+from utils.cache import cache, init_cache, cached_board_read, invalidate_board
 from utils.logger import logger
 from utils.limiter import limiter
 from utils.websocket import socketio, emit_to_board
+from utils.outbox import publish_board_event
+from utils.pools import db_pool, init_db_pools
+from utils.admission import priority, init_admission
+from utils.json_provider import init_json_provider
 from utils.helpers import (
     with_db_session,
     board_access_required,
     board_editor_required,
     board_owner_required,
     board_admin_required,
+    get_board_access,
+    get_request_json,
     success_response,
     error_response,
     not_found_response,
     bad_request_response,
     unauthorized_response,
     forbidden_response,
+    busy_response,
     parse_uuid,
+    encode_cursor,
+    parse_cursor,
     get_board_with_relations,
+    get_boards_for_user,
     get_lists_by_board,
-    get_cards_by_list,
+    get_card_rows,
+    get_list_rows_with_cards,
     get_card_with_relations,
     get_labels_by_board,
     get_label_with_board,
     get_comments_by_card,
     get_comment_with_relations,
-    get_board_member_with_user
+    get_board_member_with_user,
+    insert_if_absent
 )
 
 __all__ = [
     'token_required',
     'cache',
     'init_cache',
+    'cached_board_read',
+    'invalidate_board',
     'logger',
     'limiter',
     'socketio',
     'emit_to_board',
+    'publish_board_event',
+    'db_pool',
+    'init_db_pools',
+    'priority',
+    'init_admission',
+    'init_json_provider',
     'with_db_session',
     'board_access_required',
     'board_editor_required',
     'board_owner_required',
     'board_admin_required',
+    'get_board_access',
+    'get_request_json',
     'success_response',
     'error_response',
     'not_found_response',
     'bad_request_response',
     'unauthorized_response',
     'forbidden_response',
+    'busy_response',
     'parse_uuid',
+    'encode_cursor',
+    'parse_cursor',
     'get_board_with_relations',
+    'get_boards_for_user',
     'get_lists_by_board',
-    'get_cards_by_list',
+    'get_card_rows',
+    'get_list_rows_with_cards',
     'get_card_with_relations',
     'get_labels_by_board',
     'get_label_with_board',
     'get_comments_by_card',
     'get_comment_with_relations',
-    'get_board_member_with_user'
+    'get_board_member_with_user',
+    'insert_if_absent'
 ]
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Board access control lists.
+
+A BoardACL is the compact authorization state of a board: its owner and a
+user_id -> role map of its members. ACLs are cached in process and in Redis
+so the board_*_required decorators can authorize with a dict lookup instead
+of loading the board with all of its members.
+"""
+import uuid
+from sqlalchemy import event, select, and_
+from config import Config
+from database import Session, primary_reads
+from models import Board, BoardMember, List, Card, Label
+from models.enums import BoardRole
+from utils.cache import cache
+from utils.lru import TTLCache
+from utils.metrics import Counters, register_metrics
+
+
+class BoardACL:
+    __slots__ = ("board_id", "owner_id", "roles")
+
+    def __init__(self, board_id, owner_id, roles):
+        self.board_id = board_id
+        self.owner_id = owner_id
+        self.roles = roles  # {user_id: BoardRole}
+
+    def is_owner(self, user_id):
+        return user_id == self.owner_id
+
+    def role_of(self, user_id):
+        return self.roles.get(user_id)
+
+    def has_access(self, user_id):
+        return self.is_owner(user_id) or user_id in self.roles
+
+    def access_for(self, user_id):
+        """The BoardAccess of a single user."""
+        return BoardAccess(self.board_id, self.owner_id, user_id, self.roles.get(user_id))
+
+    def can_edit(self, user_id):
+        return self.is_owner(user_id) or self.roles.get(user_id) in (BoardRole.ADMIN, BoardRole.EDITOR)
+
+    def is_admin(self, user_id):
+        return self.is_owner(user_id) or self.roles.get(user_id) == BoardRole.ADMIN
+
+    def to_dict(self):
+        return {
+            "owner_id": str(self.owner_id),
+            "roles": {str(user_id): role.value for user_id, role in self.roles.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, board_id, data):
+        return cls(
+            board_id,
+            uuid.UUID(data["owner_id"]),
+            {uuid.UUID(user_id): BoardRole(role) for user_id, role in data["roles"].items()}
+        )
+
+
+class BoardAccess:
+    """One user's access to one board, as resolved for a request."""
+    __slots__ = ("board_id", "owner_id", "user_id", "role")
+
+    def __init__(self, board_id, owner_id, user_id, role):
+        self.board_id = board_id
+        self.owner_id = owner_id
+        self.user_id = user_id
+        self.role = role  # BoardRole, or None for the owner/non-members
+
+    @property
+    def is_owner(self):
+        return self.user_id == self.owner_id
+
+    @property
+    def has_access(self):
+        return self.is_owner or self.role is not None
+
+    @property
+    def can_edit(self):
+        return self.is_owner or self.role in (BoardRole.ADMIN, BoardRole.EDITOR)
+
+    @property
+    def is_admin(self):
+        return self.is_owner or self.role == BoardRole.ADMIN
+
+
+# The in-process copy is what makes authorization O(1); its TTL bounds how
+# long another worker can act on a membership change made elsewhere.
+_local_acls = TTLCache(Config.BOARD_ACL_CACHE_SIZE, Config.BOARD_ACL_LOCAL_TTL)
+acl_stats = Counters("redis_hits", "db_loads")
+register_metrics("board_acl_cache", lambda: {**_local_acls.metrics(), **acl_stats.snapshot()})
+
+
+def _acl_key(board_id):
+    return f"board_{board_id}_acl"
+
+
+def load_board_acl(session, board_id):
+    """Load a board's ACL from the database in one query. None if the board does not exist."""
+    rows = session.execute(
+        select(Board.owner_id, BoardMember.user_id, BoardMember.role)
+        .outerjoin(BoardMember, BoardMember.board_id == Board.board_id)
+        .where(Board.board_id == board_id)
+    ).all()
+
+    if not rows:
+        return None
+
+    return BoardACL(
+        board_id,
+        rows[0].owner_id,
+        {row.user_id: row.role for row in rows if row.user_id is not None}
+    )
+
+
+def get_board_acl(session, board_id):
+    """Get a board's ACL from the process cache, Redis, or the database (in that order)."""
+    if isinstance(board_id, str):
+        board_id = uuid.UUID(board_id)
+
+    acl = _local_acls.get(board_id)
+    if acl is not None:
+        return acl
+
+    data = cache.get(_acl_key(board_id))
+    if data is not None:
+        acl_stats.incr("redis_hits")
+        acl = BoardACL.from_dict(board_id, data)
+    else:
+        acl_stats.incr("db_loads")
+        # Always from the primary: a stale ACL would be cached for every worker
+        with primary_reads():
+            acl = load_board_acl(session, board_id)
+        if acl is None:
+            return None
+        cache.set(_acl_key(board_id), acl.to_dict(), timeout=Config.BOARD_ACL_REDIS_TTL)
+
+    _local_acls.set(board_id, acl)
+    return acl
+
+
+def invalidate_board_acl(session, board_id):
+    """Drop a board's cached ACL now and again once the session's transaction commits."""
+    _local_acls.invalidate(board_id)
+    session.info.setdefault("invalidated_acls", set()).add(board_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_invalidated_acls(session):
+    for board_id in session.info.pop("invalidated_acls", ()):
+        _local_acls.invalidate(board_id)
+        cache.delete(_acl_key(board_id))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidated_acls(session):
+    session.info.pop("invalidated_acls", None)
+
+
+# ============================================================================
+# RESOURCE -> BOARD RESOLUTION
+# ============================================================================
+
+def _resource_board_query(resource_type, resource_uuid):
+    """Select the owning board's id and owner for a list, card or label."""
+    query = select(Board.board_id, Board.owner_id)
+    if resource_type == 'list':
+        return query.select_from(List).join(
+            Board, Board.board_id == List.board_id
+        ).where(List.list_id == resource_uuid)
+    if resource_type == 'card':
+        return query.select_from(Card).join(
+            List, List.list_id == Card.list_id
+        ).join(
+            Board, Board.board_id == List.board_id
+        ).where(Card.card_id == resource_uuid)
+    if resource_type == 'label':
+        return query.select_from(Label).join(
+            Board, Board.board_id == Label.board_id
+        ).where(Label.label_id == resource_uuid)
+    raise ValueError(f"Unknown resource type: {resource_type}")
+
+
+def resolve_board_access(session, resource_type, resource_uuid, user_id):
+    """
+    Resolve a resource to its board and the user's role on it.
+
+    Boards are answered from the cached ACL. Lists, cards and labels take a
+    single joined query that also fetches the user's membership row.
+
+    Returns:
+        BoardAccess, or None if the resource does not exist
+    """
+    if resource_type == 'board':
+        acl = get_board_acl(session, resource_uuid)
+        return acl.access_for(user_id) if acl else None
+
+    query = _resource_board_query(resource_type, resource_uuid).add_columns(
+        BoardMember.role
+    ).outerjoin(
+        BoardMember,
+        and_(BoardMember.board_id == Board.board_id, BoardMember.user_id == user_id)
+    )
+    row = session.execute(query).first()
+    if row is None:
+        return None
+    return BoardAccess(row.board_id, row.owner_id, user_id, row.role)
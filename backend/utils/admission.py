@@ -0,0 +1,93 @@
+"""
+Admission control: shed load before requests pile up on the database pools.
+
+Every request is counted in flight against its route class (utils/pools.py)
+until it is torn down. A request is turned away with 503 and Retry-After
+when its class already has Config.ADMISSION_LIMITS in flight or queued for
+a pool connection. Routes marked @priority("low") (dashboards, comment
+history) are turned away earlier, at ADMISSION_LOW_PRIORITY_SHARE of those
+limits, which keeps room for everything else; routes marked
+@priority("critical") (auth, card and list moves) are always admitted.
+"""
+import threading
+from flask import current_app, g, request
+from config import Config
+from database import checkout_waiters
+from utils.helpers import busy_response
+from utils.metrics import Counters, register_metrics
+from utils.pools import request_pool_name
+
+admission_stats = Counters()
+
+
+class InFlight:
+    """Requests in flight per route class."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {name: 0 for name in Config.ADMISSION_LIMITS}
+
+    def add(self, name, amount):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def get(self, name):
+        with self._lock:
+            return self._counts.get(name, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+in_flight = InFlight()
+register_metrics("admission", lambda: {"in_flight": in_flight.snapshot(), **admission_stats.snapshot()})
+
+
+def priority(level):
+    """Mark a route as "low" (shed first) or "critical" (never shed) priority."""
+    def decorator(view):
+        view.priority = level
+        return view
+    return decorator
+
+
+def _over_limit(pool_name, share):
+    limits = Config.ADMISSION_LIMITS.get(pool_name)
+    if limits is None:
+        return False
+    return (
+        in_flight.get(pool_name) >= limits["max_in_flight"] * share
+        or checkout_waiters.get(pool_name) >= limits["max_waiting"] * share
+    )
+
+
+def init_admission(app):
+    """Admit or shed each request before it reaches its blueprint."""
+    if not Config.ADMISSION_CONTROL:
+        return
+
+    @app.before_request
+    def admit_request():
+        if request.endpoint is None:
+            return None
+
+        view = current_app.view_functions.get(request.endpoint)
+        level = getattr(view, "priority", "normal")
+        pool_name = request_pool_name()
+
+        if level != "critical":
+            share = Config.ADMISSION_LOW_PRIORITY_SHARE if level == "low" else 1
+            if _over_limit(pool_name, share):
+                admission_stats.incr(f"{pool_name}_{level}_rejected")
+                return busy_response()
+
+        in_flight.add(pool_name, 1)
+        g.admitted_pool = pool_name
+        return None
+
+    @app.teardown_request
+    def release_request(exc=None):
+        pool_name = g.pop("admitted_pool", None)
+        if pool_name is not None:
+            in_flight.add(pool_name, -1)
@@ -1,10 +1,66 @@
 import uuid
+from collections import namedtuple
 from functools import wraps
 from flask import request, jsonify, g
 import jwt
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 from config import Config
 from models import User
-from database import Session
+from database import Session, db_session, primary_reads
+from utils.lru import TTLCache
+from utils.metrics import register_metrics
+from utils.replicas import READ_METHODS, route_session
+
+
+# Authenticated user as seen by the controllers (g.current_user)
+Principal = namedtuple("Principal", ["user_id", "name", "email"])
+
+# Per-process cache of principals keyed by user id. Entries are dropped when
+# the user row changes in this process and expire after PRINCIPAL_CACHE_TTL.
+principal_cache = TTLCache(Config.PRINCIPAL_CACHE_SIZE, Config.PRINCIPAL_CACHE_TTL)
+register_metrics("principal_cache", principal_cache.metrics)
+
+
+def load_principal(user_uuid):
+    """Get the principal for a user id, from cache or the database. None if the user does not exist."""
+    principal = principal_cache.get(user_uuid)
+    if principal is not None:
+        return principal
+
+    # The request's session, so a cache miss costs no extra connection. Read
+    # from the primary so a just-created user is never missed on a replica.
+    with primary_reads():
+        user = db_session().get(User, user_uuid)
+
+    if not user:
+        return None
+
+    principal = Principal(user.user_id, user.name, user.email)
+    principal_cache.set(user_uuid, principal)
+    return principal
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    principal_cache.invalidate(target.user_id)
+    # Drop again after commit in case a concurrent request re-cached the old row
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("invalidated_users", set()).add(target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("invalidated_users", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("invalidated_users", None)
+
 
 # def admin_required(f):
 #     @wraps(f)
@@ -41,9 +97,8 @@ def token_required(f):
         except jwt.InvalidTokenError:
             return jsonify({"message": "Token is invalid"}), 401
 
-        session = Session()
-        current_user = session.query(User).get(user_uuid)
-        session.close()
+        route_session(db_session(), user_uuid, read_only=request.method in READ_METHODS)
+        current_user = load_principal(user_uuid)
 
         if not current_user:
             return jsonify({"message": "User not found"}), 401
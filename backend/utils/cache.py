@@ -1,5 +1,9 @@
 from flask_caching import Cache
-import os
+from sqlalchemy import event
+from database import Session, primary_reads
+from utils.metrics import Counters, register_metrics
+from config import Config
+import time
 cache = Cache()
 
 def init_cache(app):
@@ -10,8 +14,8 @@ def init_cache(app):
     try:
         # Try Redis first for production performance
         app.config["CACHE_TYPE"] = "RedisCache"
-        app.config["CACHE_REDIS_HOST"] = os.getenv("REDIS_HOST", "localhost")
-        app.config["CACHE_REDIS_PORT"] = 6379
+        app.config["CACHE_REDIS_HOST"] = Config.REDIS_HOST
+        app.config["CACHE_REDIS_PORT"] = Config.REDIS_PORT
         app.config["CACHE_REDIS_DB"] = 0
         app.config["CACHE_DEFAULT_TIMEOUT"] = 300  # 5 minutes
         app.config["CACHE_KEY_PREFIX"] = "kanban_"
@@ -31,11 +35,89 @@ def init_cache(app):
         print("✓ Redis cache initialized successfully")
         
     except Exception as e:
+        if not Config.CACHE_ALLOW_FALLBACK:
+            raise RuntimeError(f"Redis cache not available: {e}") from e
+
         print(f"⚠ Redis not available ({str(e)}), falling back to SimpleCache")
         
         # Fallback to SimpleCache (in-memory)
         app.config["CACHE_TYPE"] = "SimpleCache"
         app.config["CACHE_DEFAULT_TIMEOUT"] = 300
         app.config["CACHE_THRESHOLD"] = 500  # Max items to store
+        app.config.pop("CACHE_OPTIONS", None)  # Redis connection options
         
         cache.init_app(app)
+
+
+# ============================================================================
+# BOARD-SCOPED READ-THROUGH CACHE
+# ============================================================================
+#
+# Every cached read for a board is keyed by the board's current generation.
+# Mutations bump the generation once their transaction commits, which makes
+# all of the board's entries unreachable for every member at once; stale
+# entries simply age out through the default timeout.
+
+board_cache_stats = Counters("hits", "misses", "invalidations")
+register_metrics("board_cache", board_cache_stats.snapshot)
+
+
+def _generation_key(board_id):
+    return f"board_{board_id}_generation"
+
+
+def board_generation(board_id):
+    """Get the current cache generation of a board."""
+    key = _generation_key(board_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so a lost key never resurrects old entries
+        cache.add(key, time.time_ns(), timeout=0)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_board_generation(board_id):
+    """Move a board to a fresh cache generation."""
+    cache.set(_generation_key(board_id), time.time_ns(), timeout=0)
+    board_cache_stats.incr("invalidations")
+
+
+def cached_board_read(board_id, name, loader, timeout=None):
+    """
+    Return the cached value for a board-scoped read, calling loader() on a miss.
+    The loader must return serializable data (e.g. a schema dump).
+    """
+    generation = board_generation(board_id)
+    key = f"board_{board_id}_{generation}_{name}"
+    value = cache.get(key)
+    if value is not None:
+        board_cache_stats.incr("hits")
+        return value
+
+    board_cache_stats.incr("misses")
+    # The generation is the time of the board's last write. Until replicas
+    # have caught up with it, fill the cache from the primary.
+    if time.time_ns() - generation < Config.DB_READ_YOUR_WRITES_WINDOW * 1e9:
+        with primary_reads():
+            value = loader()
+    else:
+        value = loader()
+    cache.set(key, value, timeout=timeout)
+    return value
+
+
+def invalidate_board(session, board_id):
+    """Bump the board's cache generation once the session's transaction commits."""
+    session.info.setdefault("invalidated_boards", set()).add(board_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_invalidated_boards(session):
+    for board_id in session.info.pop("invalidated_boards", ()):
+        bump_board_generation(board_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidated_boards(session):
+    session.info.pop("invalidated_boards", None)
@@ -0,0 +1,165 @@
+"""
+Registry of live Socket.IO connections and the boards they have joined.
+
+The memory registry only sees the sockets of its own process. The Redis
+registry is shared, so any worker can tell who is connected to a board no
+matter which worker holds the socket.
+"""
+import threading
+import time
+import redis
+from config import Config
+
+
+class SocketRecord:
+    __slots__ = ("user_id", "boards")
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.boards = set()
+
+
+class MemoryConnectionRegistry:
+    """Connection registry for a single process (local dev, tests)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sockets = {}  # sid -> SocketRecord
+        self._boards = {}  # board_id -> {sid: user_id}
+
+    def join(self, sid, user_id, board_id):
+        with self._lock:
+            record = self._sockets.get(sid)
+            if record is None:
+                record = self._sockets[sid] = SocketRecord(user_id)
+            record.boards.add(board_id)
+            self._boards.setdefault(board_id, {})[sid] = user_id
+
+    def leave(self, sid, board_id):
+        with self._lock:
+            record = self._sockets.get(sid)
+            if record is not None:
+                record.boards.discard(board_id)
+            self._remove_from_board(sid, board_id)
+
+    def disconnect(self, sid):
+        """Forget a socket. Returns the board_ids it had joined."""
+        with self._lock:
+            record = self._sockets.pop(sid, None)
+            if record is None:
+                return set()
+            for board_id in record.boards:
+                self._remove_from_board(sid, board_id)
+            return record.boards
+
+    def heartbeat(self):
+        """Nothing to refresh: entries live and die with this process."""
+
+    def board_connections(self, board_id):
+        """Get {sid: user_id} for the sockets joined to a board."""
+        with self._lock:
+            return dict(self._boards.get(board_id, {}))
+
+    def _remove_from_board(self, sid, board_id):
+        board = self._boards.get(board_id)
+        if board is not None:
+            board.pop(sid, None)
+            if not board:
+                del self._boards[board_id]
+
+
+class RedisConnectionRegistry:
+    """
+    Connection registry shared by every worker through Redis.
+
+    Each board is a sorted set of "sid:user_id" scored by the socket's last
+    heartbeat. Workers re-score the sockets they hold every
+    CONNECTION_HEARTBEAT_INTERVAL (heartbeat()), and reads drop members not
+    seen for CONNECTION_TTL, so sockets of a crashed or restarted worker
+    leave presence within the TTL however busy the board is.
+    """
+
+    def __init__(self, client, ttl):
+        self._redis = client
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._sockets = {}  # sid -> SocketRecord, for the sockets of this process
+
+    @staticmethod
+    def _board_key(board_id):
+        return f"kanban_board_{board_id}_sockets"  # sorted set: "sid:user_id" -> last heartbeat
+
+    @staticmethod
+    def _member(sid, user_id):
+        return f"{sid}:{user_id}"
+
+    def _touch(self, pipe, board_id, member, now):
+        pipe.zadd(self._board_key(board_id), {member: now})
+        pipe.expire(self._board_key(board_id), self._ttl)
+
+    def join(self, sid, user_id, board_id):
+        with self._lock:
+            record = self._sockets.get(sid)
+            if record is None:
+                record = self._sockets[sid] = SocketRecord(user_id)
+            record.boards.add(board_id)
+
+        pipe = self._redis.pipeline()
+        self._touch(pipe, board_id, self._member(sid, user_id), time.time())
+        pipe.execute()
+
+    def leave(self, sid, board_id):
+        with self._lock:
+            record = self._sockets.get(sid)
+            if record is None:
+                return
+            record.boards.discard(board_id)
+        self._redis.zrem(self._board_key(board_id), self._member(sid, record.user_id))
+
+    def disconnect(self, sid):
+        """Forget a socket. Returns the board_ids it had joined."""
+        with self._lock:
+            record = self._sockets.pop(sid, None)
+        if record is None:
+            return set()
+
+        pipe = self._redis.pipeline()
+        for board_id in record.boards:
+            pipe.zrem(self._board_key(board_id), self._member(sid, record.user_id))
+        pipe.execute()
+        return record.boards
+
+    def heartbeat(self):
+        """Mark every socket of this process as still connected."""
+        with self._lock:
+            entries = [
+                (board_id, self._member(sid, record.user_id))
+                for sid, record in self._sockets.items()
+                for board_id in record.boards
+            ]
+        if not entries:
+            return
+
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=False)
+        for board_id, member in entries:
+            self._touch(pipe, board_id, member, now)
+        pipe.execute()
+
+    def board_connections(self, board_id):
+        """Get {sid: user_id} for the sockets joined to a board, dropping ones past the TTL."""
+        key = self._board_key(board_id)
+        pipe = self._redis.pipeline()
+        pipe.zremrangebyscore(key, "-inf", time.time() - self._ttl)
+        pipe.zrange(key, 0, -1)
+        _, members = pipe.execute()
+        return dict(member.decode().split(":", 1) for member in members)
+
+
+def create_connection_registry():
+    if Config.CONNECTION_REGISTRY == "redis":
+        return RedisConnectionRegistry(redis.Redis.from_url(Config.REDIS_URL), Config.CONNECTION_TTL)
+    return MemoryConnectionRegistry()
+
+
+connections = create_connection_registry()
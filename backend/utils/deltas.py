@@ -0,0 +1,47 @@
+"""
+Delta payloads for card events.
+
+With BOARD_EVENT_FORMAT=delta, card:updated and card:moved carry only the
+fields that changed (a JSON merge patch over the card) and the card's
+version, instead of the full card with its labels and assignees.
+"""
+from sqlalchemy import inspect
+from config import Config
+
+# Card column -> serialized fields it changes. Position is derived from the
+# card's rank among its siblings, so it changes with the rank or the list.
+CARD_PATCH_FIELDS = {
+    'title': ('title',),
+    'description': ('description',),
+    'due_date': ('due_date',),
+    'list_id': ('list_id', 'position'),
+    'rank': ('position',),
+}
+
+
+def changed_fields(obj, field_map):
+    """
+    Get the serialized fields whose columns have pending changes on obj.
+    Must be called before the session flushes, which resets the history.
+    """
+    state = inspect(obj)
+    return {
+        field
+        for column, fields in field_map.items()
+        if state.attrs[column].history.has_changes()
+        for field in fields
+    }
+
+
+def card_event(card_data, changed, **extra):
+    """Build a card event payload in the configured format."""
+    if Config.BOARD_EVENT_FORMAT != "delta":
+        return {'card': card_data, **extra}
+
+    return {
+        'card_id': card_data['card_id'],
+        'list_id': card_data['list_id'],
+        'version': card_data['version'],
+        'patch': {field: card_data[field] for field in sorted(changed)},
+        **extra
+    }
@@ -0,0 +1,60 @@
+"""
+Opt-in binary encoding of board events.
+
+Clients that connect with auth {'encoding': 'msgpack'} (and a server with
+SOCKETIO_MSGPACK enabled) join a separate room per board and get the data
+of every event as one binary argument: a flag byte followed by the
+MessagePack-encoded data, deflated (zlib) when larger than
+SOCKETIO_COMPRESSION_THRESHOLD bytes. Everyone else keeps getting JSON.
+
+Each event is encoded once per emit, however many sockets are in the room.
+"""
+import zlib
+from config import Config
+from utils.metrics import Counters, register_metrics
+
+try:
+    import msgpack
+except ImportError:  # Only needed with SOCKETIO_MSGPACK enabled
+    msgpack = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+# First byte of an encoded payload
+RAW = 0
+DEFLATED = 1
+
+encoding_stats = Counters("encoded", "deflated", "bytes_in", "bytes_out")
+register_metrics("socket_encoding", encoding_stats.snapshot)
+
+
+def msgpack_enabled():
+    return Config.SOCKETIO_MSGPACK and msgpack is not None
+
+
+def negotiate_encoding(auth):
+    """Get the encoding for a new connection from its auth payload."""
+    requested = auth.get('encoding') if isinstance(auth, dict) else None
+    return MSGPACK if requested == MSGPACK and msgpack_enabled() else JSON
+
+
+def board_room(board_id, encoding=JSON):
+    room = f"board_{board_id}"
+    return room if encoding == JSON else f"{room}:{encoding}"
+
+
+def encode_event_data(data):
+    """Encode event data for msgpack sockets."""
+    packed = msgpack.packb(data)
+    encoding_stats.incr("encoded")
+    encoding_stats.incr("bytes_in", len(packed))
+
+    if len(packed) > Config.SOCKETIO_COMPRESSION_THRESHOLD:
+        encoded = bytes([DEFLATED]) + zlib.compress(packed)
+        encoding_stats.incr("deflated")
+    else:
+        encoded = bytes([RAW]) + packed
+
+    encoding_stats.incr("bytes_out", len(encoded))
+    return encoded
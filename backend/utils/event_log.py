@@ -0,0 +1,131 @@
+"""
+Per-board event sequence numbers and a bounded log of recent events.
+
+Every event sent to a board room is numbered from a per-board counter and
+kept in a ring buffer, so a client that reconnects can send the last
+sequence number it saw and get only the events it missed. When the gap is
+larger than the buffer the client has to refetch the board instead.
+"""
+import json
+import threading
+from collections import deque
+import redis
+from config import Config
+
+
+class MemoryEventLog:
+    """Event log for a single process (local dev, tests)."""
+
+    def __init__(self, size):
+        self._size = size
+        self._lock = threading.Lock()
+        self._boards = {}  # board_id -> [last seq, deque of (seq, event, data)]
+
+    def append(self, board_id, event, data):
+        """Number an event and keep it. Returns the data with its seq added."""
+        with self._lock:
+            board = self._boards.setdefault(board_id, [0, deque(maxlen=self._size)])
+            board[0] += 1
+            data = {**data, 'seq': board[0]}
+            board[1].append((board[0], event, data))
+            return data
+
+    def current(self, board_id):
+        with self._lock:
+            board = self._boards.get(board_id)
+            return board[0] if board else 0
+
+    def since(self, board_id, last_seq):
+        """
+        Get the events after last_seq.
+
+        Returns:
+            (current seq, [(event, data), ...]), or (current seq, None) if
+            some of the missed events are no longer buffered
+        """
+        with self._lock:
+            current, entries = self._boards.get(board_id, (0, ()))
+            missed = [(event, data) for seq, event, data in entries if seq > last_seq]
+        return current, _complete_or_none(current, last_seq, missed)
+
+
+# Numbers and stores an event in one step, so a reader never sees a seq
+# whose entry is not in the log yet. Entries are "<seq>:<[event, data]>".
+_APPEND_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('ZADD', KEYS[2], seq, seq .. ':' .. ARGV[1])
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[2]) - 1)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return seq
+"""
+
+
+class RedisEventLog:
+    """Event log shared by every worker through Redis."""
+
+    def __init__(self, client, size, ttl):
+        self._redis = client
+        self._size = size
+        self._ttl = ttl
+        self._append = client.register_script(_APPEND_SCRIPT)
+
+    @staticmethod
+    def _seq_key(board_id):
+        return f"kanban_board_{board_id}_seq"
+
+    @staticmethod
+    def _log_key(board_id):
+        return f"kanban_board_{board_id}_event_log"  # sorted set scored by seq
+
+    def append(self, board_id, event, data):
+        """Number an event and keep it. Returns the data with its seq added."""
+        seq = self._append(
+            keys=[self._seq_key(board_id), self._log_key(board_id)],
+            args=[json.dumps([event, data]), self._size, self._ttl]
+        )
+        return {**data, 'seq': seq}
+
+    def current(self, board_id):
+        return int(self._redis.get(self._seq_key(board_id)) or 0)
+
+    def since(self, board_id, last_seq):
+        """
+        Get the events after last_seq.
+
+        Returns:
+            (current seq, [(event, data), ...]), or (current seq, None) if
+            some of the missed events are no longer buffered
+        """
+        pipe = self._redis.pipeline()
+        pipe.get(self._seq_key(board_id))
+        pipe.zrangebyscore(self._log_key(board_id), f"({last_seq}", "+inf")
+        current, entries = pipe.execute()
+
+        current = int(current or 0)
+        missed = []
+        for entry in entries:
+            seq, payload = entry.split(b":", 1)
+            event, data = json.loads(payload)
+            missed.append((event, {**data, 'seq': int(seq)}))
+        return current, _complete_or_none(current, last_seq, missed)
+
+
+def _complete_or_none(current, last_seq, missed):
+    # A client ahead of the log (e.g. after a Redis flush) must resync too
+    if last_seq > current or len(missed) < current - last_seq:
+        return None
+    return missed
+
+
+def create_event_log():
+    if Config.BOARD_EVENT_LOG == "redis":
+        return RedisEventLog(
+            redis.Redis.from_url(Config.REDIS_URL),
+            Config.BOARD_EVENT_BUFFER_SIZE,
+            Config.BOARD_EVENT_LOG_TTL
+        )
+    return MemoryEventLog(Config.BOARD_EVENT_BUFFER_SIZE)
+
+
+event_log = create_event_log()
@@ -3,12 +3,20 @@ Helper utilities for the backend.
 Includes decorators, response helpers, cache utilities, and query helpers.
 """
 from functools import wraps
-from flask import jsonify, g
-from database import Session
+from flask import jsonify, g, request
+from database import db_session
+from config import Config
 from models import Board, List, Card, Label, Comment, BoardMember
-from models.enums import BoardRole
 from marshmallow import ValidationError
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, union, func, tuple_
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload, selectinload, with_expression
+from utils.ranking import position_expression
+from utils.acl import resolve_board_access
+import base64
+import json
 import uuid
 
 
@@ -19,11 +27,12 @@ import uuid
 def with_db_session(func):
     """
     Decorator that handles database session management.
-    Automatically creates session, commits on success, rolls back on error, and closes session.
+    Passes the request's session, commits on success, rolls back on error, and
+    closes the session (returning its connection to the pool, if it took one).
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        session = Session()
+        session = db_session()
         try:
             # Pass session to the function
             result = func(session, *args, **kwargs)
@@ -32,6 +41,14 @@ def with_db_session(func):
         except ValidationError as err:
             session.rollback()
             return jsonify(err.messages), 400
+        except PoolTimeoutError:
+            # Waited pool_timeout for a connection; fail fast rather than pile up
+            session.rollback()
+            return busy_response()
+        except StaleDataError:
+            # A versioned row (Card.version) was updated by a concurrent request
+            session.rollback()
+            return error_response("This item was changed by someone else, please reload and retry", 409)
         except Exception as e:
             session.rollback()
             from utils.logger import logger
@@ -45,6 +62,11 @@ def with_db_session(func):
 # ============================================================================
 # BOARD ACCESS DECORATORS
 # ============================================================================
+#
+# The decorators resolve the caller's access to the resource's board with at
+# most one query (utils/acl.py) and never load the board itself. They set
+# g.board_id and g.board_access for use in the controller; controllers that
+# need the Board row or other members' roles load them themselves.
 
 def board_access_required(resource_type, param_name):
     """
@@ -54,33 +76,26 @@ def board_access_required(resource_type, param_name):
         resource_type: Type of resource ('board', 'list', 'card', 'label')
         param_name: Name of the parameter containing the resource ID
     
-    Sets g.board with the board object for use in the controller.
+    Sets g.board_id and g.board_access for use in the controller.
     """
     def decorator(func):
         @wraps(func)
         def wrapper(session, *args, **kwargs):
-            current_user = g.current_user
             resource_id = kwargs.get(param_name)
             
             if not resource_id:
                 return jsonify({"message": f"{param_name} is required"}), 400
             
-            # Get board based on resource type
-            board = _get_board_from_resource(session, resource_type, resource_id)
+            access = get_board_access(session, resource_type, resource_id)
             
-            if not board:
+            if not access:
                 return jsonify({"message": f"{resource_type.capitalize()} not found"}), 404
             
-            # Check access
-            is_owner = board.owner_id == current_user.user_id
-            is_member = any(member.user_id == current_user.user_id for member in board.members)
-            
-            if not (is_owner or is_member):
+            if not access.has_access:
                 return jsonify({"message": "You do not have access to this board"}), 403
             
-            # Store board in g for use in controller
-            g.board = board
-            
+            g.board_id = access.board_id
+            g.board_access = access
             return func(session, *args, **kwargs)
         return wrapper
     return decorator
@@ -95,40 +110,29 @@ def board_editor_required(resource_type, param_name):
         resource_type: Type of resource ('board', 'list', 'card', 'label')
         param_name: Name of the parameter containing the resource ID
     
-    Sets g.board with the board object for use in the controller.
+    Sets g.board_id and g.board_access for use in the controller.
     """
     def decorator(func):
         @wraps(func)
         def wrapper(session, *args, **kwargs):
-            current_user = g.current_user
             resource_id = kwargs.get(param_name)
             
             if not resource_id:
                 return jsonify({"message": f"{param_name} is required"}), 400
             
-            # Get board based on resource type
-            board = _get_board_from_resource(session, resource_type, resource_id)
+            access = get_board_access(session, resource_type, resource_id)
             
-            if not board:
+            if not access:
                 return jsonify({"message": f"{resource_type.capitalize()} not found"}), 404
             
-            # Check if owner
-            is_owner = board.owner_id == current_user.user_id
-            
-            if is_owner:
-                g.board = board
-                return func(session, *args, **kwargs)
-            
-            # Check if member with edit permissions
-            member = next((m for m in board.members if m.user_id == current_user.user_id), None)
-            
-            if not member:
+            if not access.has_access:
                 return jsonify({"message": "You do not have access to this board"}), 403
             
-            if member.role == BoardRole.VIEWER:
+            if not access.can_edit:
                 return jsonify({"message": "You do not have permission to edit this board"}), 403
             
-            g.board = board
+            g.board_id = access.board_id
+            g.board_access = access
             return func(session, *args, **kwargs)
         return wrapper
     return decorator
@@ -141,12 +145,11 @@ def board_owner_required(param_name):
     Args:
         param_name: Name of the parameter containing the board ID
     
-    Sets g.board with the board object for use in the controller.
+    Sets g.board_id and g.board_access for use in the controller.
     """
     def decorator(func):
         @wraps(func)
         def wrapper(session, *args, **kwargs):
-            current_user = g.current_user
             board_id = kwargs.get(param_name)
             
             if not board_id:
@@ -156,15 +159,16 @@ def board_owner_required(param_name):
             if error:
                 return error
             
-            board = get_board_with_relations(session, board_uuid)
+            access = get_board_access(session, 'board', board_uuid)
             
-            if not board:
+            if not access:
                 return jsonify({"message": "Board not found"}), 404
             
-            if board.owner_id != current_user.user_id:
+            if not access.is_owner:
                 return jsonify({"message": "Only the board owner can perform this action"}), 403
             
-            g.board = board
+            g.board_id = access.board_id
+            g.board_access = access
             return func(session, *args, **kwargs)
         return wrapper
     return decorator
@@ -178,12 +182,11 @@ def board_admin_required(param_name):
     Args:
         param_name: Name of the parameter containing the board ID
     
-    Sets g.board with the board object for use in the controller.
+    Sets g.board_id and g.board_access for use in the controller.
     """
     def decorator(func):
         @wraps(func)
         def wrapper(session, *args, **kwargs):
-            current_user = g.current_user
             board_id = kwargs.get(param_name)
             
             if not board_id:
@@ -193,28 +196,19 @@ def board_admin_required(param_name):
             if error:
                 return error
             
-            board = get_board_with_relations(session, board_uuid)
+            access = get_board_access(session, 'board', board_uuid)
             
-            if not board:
+            if not access:
                 return jsonify({"message": "Board not found"}), 404
             
-            # Check if owner
-            is_owner = board.owner_id == current_user.user_id
-            
-            if is_owner:
-                g.board = board
-                return func(session, *args, **kwargs)
-            
-            # Check if member with admin role
-            member = next((m for m in board.members if m.user_id == current_user.user_id), None)
-            
-            if not member:
+            if not access.has_access:
                 return jsonify({"message": "You do not have access to this board"}), 403
             
-            if member.role != BoardRole.ADMIN:
+            if not access.is_admin:
                 return jsonify({"message": "Only board admins can perform this action"}), 403
             
-            g.board = board
+            g.board_id = access.board_id
+            g.board_access = access
             return func(session, *args, **kwargs)
         return wrapper
     return decorator
@@ -224,30 +218,44 @@ def board_admin_required(param_name):
 # HELPER FUNCTIONS FOR DECORATORS
 # ============================================================================
 
-def _get_board_from_resource(session, resource_type, resource_id):
-    """Get board from different resource types."""
-    resource_uuid, error = parse_uuid(resource_id, f"{resource_type} ID")
-    if error:
-        return None
-    
-    if resource_type == 'board':
-        return get_board_with_relations(session, resource_uuid)
-    elif resource_type == 'list':
-        list_obj = session.query(List).filter_by(list_id=resource_uuid).first()
-        if list_obj:
-            return get_board_with_relations(session, list_obj.board_id)
-    elif resource_type == 'card':
-        card = session.query(Card).filter_by(card_id=resource_uuid).first()
-        if card:
-            list_obj = session.query(List).filter_by(list_id=card.list_id).first()
-            if list_obj:
-                return get_board_with_relations(session, list_obj.board_id)
-    elif resource_type == 'label':
-        label = session.query(Label).filter_by(label_id=resource_uuid).first()
-        if label:
-            return get_board_with_relations(session, label.board_id)
-    
-    return None
+def get_board_access(session, resource_type, resource_id):
+    """
+    Get the current user's access to the board that owns a resource.
+
+    Results are memoized for the rest of the request, so resolving the same
+    resource again (e.g. from a nested helper) costs no query.
+
+    Returns:
+        BoardAccess, or None if the ID is invalid or the resource does not exist
+    """
+    if isinstance(resource_id, uuid.UUID):
+        resource_uuid = resource_id
+    else:
+        resource_uuid, error = parse_uuid(resource_id, f"{resource_type} ID")
+        if error:
+            return None
+
+    memo = g.setdefault("board_access_memo", {})
+    key = (resource_type, resource_uuid)
+    if key not in memo:
+        memo[key] = resolve_board_access(
+            session, resource_type, resource_uuid, g.current_user.user_id
+        )
+    return memo[key]
+
+
+# ============================================================================
+# REQUEST BODY
+# ============================================================================
+
+def get_request_json():
+    """
+    Get the body of the current call: the payload of a Socket.IO event when a
+    controller runs for one (routes/socket_routes.py), else the JSON body.
+    """
+    if "socket_payload" in g:
+        return g.socket_payload
+    return request.json
 
 
 # ============================================================================
@@ -292,6 +300,13 @@ def forbidden_response(message="Forbidden"):
     return jsonify({"message": message}), 403
 
 
+def busy_response(message="Server is busy, please retry shortly"):
+    """Standard overload response, telling the client when to retry."""
+    response = jsonify({"message": message})
+    response.headers["Retry-After"] = str(Config.ADMISSION_RETRY_AFTER)
+    return response, 503
+
+
 # ============================================================================
 # UUID PARSING
 # ============================================================================
@@ -309,6 +324,28 @@ def parse_uuid(uuid_string, field_name="ID"):
         return None, bad_request_response(f"Invalid {field_name} format")
 
 
+def encode_cursor(*values):
+    """Encode the sort key of the last row of a page as an opaque page cursor."""
+    data = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def parse_cursor(cursor, size, field_name="cursor"):
+    """
+    Decode a page cursor made by encode_cursor back into its values (strings).
+
+    Returns:
+        tuple: (values, error_response) - error_response is None on success
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(value, str) for value in values):
+        return None, bad_request_response(f"Invalid {field_name} format")
+    return values, None
+
+
 # ============================================================================
 # QUERY HELPERS - Centralized database queries
 # ============================================================================
@@ -324,33 +361,131 @@ def get_board_with_relations(session, board_id):
     ).filter_by(board_id=board_id).first()
 
 
+def get_boards_for_user(session, user_id, limit=None, after=None, include_members=True):
+    """
+    Get the boards a user owns or is a member of, ordered by name (then
+    board ID, between boards of the same name).
+
+    The boards come from a single query over the union of owned and member
+    board IDs. Pass the (name, board ID) of the last board of a page as
+    ``after`` to get the next one. With include_members=False the member
+    arrays are not loaded and Board.member_count is populated instead.
+    """
+    accessible = union(
+        select(Board.board_id).where(Board.owner_id == user_id),
+        select(BoardMember.board_id).where(BoardMember.user_id == user_id)
+    ).subquery()
+
+    query = session.query(Board).join(
+        accessible, accessible.c.board_id == Board.board_id
+    ).options(joinedload(Board.owner))
+
+    if include_members:
+        query = query.options(selectinload(Board.members).joinedload(BoardMember.user))
+    else:
+        query = query.options(with_expression(
+            Board.member_count,
+            select(func.count(BoardMember.member_id))
+            .where(BoardMember.board_id == Board.board_id)
+            .scalar_subquery()
+        ))
+
+    if after is not None:
+        query = query.filter(tuple_(Board.name, Board.board_id) > tuple_(*after))
+
+    query = query.order_by(Board.name, Board.board_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
 def get_lists_by_board(session, board_id):
-    """Get all lists for a board, ordered by position."""
+    """Get all lists for a board, ordered by rank."""
     if isinstance(board_id, str):
         board_id = uuid.UUID(board_id)
     
-    return session.query(List).filter_by(board_id=board_id).order_by(List.position).all()
+    return session.query(List).options(
+        with_expression(List.position, position_expression(List))
+    ).filter_by(board_id=board_id).order_by(List.rank).all()
 
 
-def get_cards_by_list(session, list_id):
-    """Get all cards for a list, ordered by position, with labels and assignees."""
-    if isinstance(list_id, str):
-        list_id = uuid.UUID(list_id)
-    
-    from models import CardAssignee, CardLabel
-    return session.query(Card).options(
-        joinedload(Card.labels).joinedload(CardLabel.label),
-        joinedload(Card.assignees).joinedload(CardAssignee.user)
-    ).filter_by(list_id=list_id).order_by(Card.position).all()
+def get_card_rows(session, list_ids):
+    """
+    Get the cards of the given lists (IDs, or a select of them) as plain
+    dicts ordered by rank, with their labels and assignees nested, for the
+    compiled serializers in utils/serializers.py. Loads columns only, with
+    three queries however many cards there are.
+    """
+    from models import CardAssignee, CardLabel, User
+    in_lists = Card.list_id.in_(list_ids)
+
+    cards = {}
+    for row in session.execute(
+        select(
+            Card.card_id, Card.list_id, Card.title, Card.description, Card.due_date, Card.version,
+            position_expression(Card).label("position")
+        ).where(in_lists).order_by(Card.rank)
+    ).mappings():
+        cards[row["card_id"]] = {**row, "labels": [], "assignees": []}
+    if not cards:
+        return []
+
+    for row in session.execute(
+        select(CardLabel.id, CardLabel.card_id, CardLabel.label_id, Label.board_id, Label.name, Label.color)
+        .join(Label, Label.label_id == CardLabel.label_id)
+        .join(Card, Card.card_id == CardLabel.card_id)
+        .where(in_lists)
+    ):
+        cards[row.card_id]["labels"].append({
+            "id": row.id, "card_id": row.card_id, "label_id": row.label_id,
+            "label": {"label_id": row.label_id, "board_id": row.board_id, "name": row.name, "color": row.color},
+        })
+
+    for row in session.execute(
+        select(CardAssignee.id, CardAssignee.card_id, CardAssignee.user_id, User.name, User.email)
+        .join(User, User.user_id == CardAssignee.user_id)
+        .join(Card, Card.card_id == CardAssignee.card_id)
+        .where(in_lists)
+    ):
+        cards[row.card_id]["assignees"].append({
+            "id": row.id, "card_id": row.card_id, "user_id": row.user_id,
+            "user": {"user_id": row.user_id, "name": row.name, "email": row.email},
+        })
+
+    return list(cards.values())
+
+
+def get_list_rows_with_cards(session, board_id):
+    """
+    Get all lists for a board as plain dicts ordered by rank, with their
+    cards as from get_card_rows. Loads columns only, with four queries.
+    """
+    if isinstance(board_id, str):
+        board_id = uuid.UUID(board_id)
+
+    lists = {
+        row["list_id"]: {**row, "cards": []}
+        for row in session.execute(
+            select(List.list_id, List.board_id, List.title, position_expression(List).label("position"))
+            .where(List.board_id == board_id).order_by(List.rank)
+        ).mappings()
+    }
+    if lists:
+        for card in get_card_rows(session, list(lists)):
+            lists[card["list_id"]]["cards"].append(card)
+    return list(lists.values())
 
 
 def get_card_with_relations(session, card_id):
-    """Get card with labels and assignees loaded."""
+    """
+    Get card with labels and assignees loaded.
+    Refreshes an already-loaded card so its position reflects any rank change.
+    """
     if isinstance(card_id, str):
         card_id = uuid.UUID(card_id)
     
     from models import CardAssignee, CardLabel
-    return session.query(Card).options(
+    return session.query(Card).populate_existing().options(
         joinedload(Card.labels).joinedload(CardLabel.label),
         joinedload(Card.assignees).joinedload(CardAssignee.user)
     ).filter_by(card_id=card_id).first()
@@ -402,3 +537,24 @@ def get_board_member_with_user(session, member_id):
     return session.query(BoardMember).options(
         joinedload(BoardMember.user)
     ).filter_by(member_id=member_id).first()
+
+
+# ============================================================================
+# WRITE HELPERS
+# ============================================================================
+
+def insert_if_absent(session, model, values, conflict_columns):
+    """
+    Insert a row unless one with the same conflict_columns already exists.
+
+    Runs a single INSERT ... ON CONFLICT DO NOTHING against the unique
+    constraint on conflict_columns, so concurrent duplicates cannot race in.
+
+    Returns:
+        The new row's primary key, or None if the row already existed
+    """
+    primary_key = model.__mapper__.primary_key[0]
+    statement = insert(model).values(**values).on_conflict_do_nothing(
+        index_elements=conflict_columns
+    ).returning(primary_key)
+    return session.execute(statement).scalar()
@@ -0,0 +1,84 @@
+"""
+orjson-backed JSON responses.
+
+OrjsonProvider encodes jsonify() responses with orjson, with the same key
+sorting, indentation and handling of dates, UUIDs and dataclasses as
+Flask's default provider. Output orjson would write differently from the
+stdlib encoder (non-ASCII or DEL characters, which Flask escapes; integers
+beyond 64 bits; non-string keys; floats that are not finite, below 1e-4 or
+from 1e16 up) is re-encoded with the stdlib, so the bytes sent are the same.
+"""
+import dataclasses
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional, Flask's default provider is used without it
+    orjson = None
+
+_PASSTHROUGH = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if orjson else 0
+)
+
+_SCALARS = frozenset((str, int, bool, type(None)))
+_CONTAINERS = frozenset((dict, list, tuple))
+
+
+def _has_unsafe_float(obj):
+    """
+    Whether obj holds a float orjson writes differently from the stdlib:
+    NaN and infinities (null rather than NaN and Infinity) and the ones
+    the stdlib writes with an exponent (1e16 rather than 1e+16, 0.00001
+    rather than 1e-05).
+    """
+    stack = [(obj,)]
+    while stack:
+        container = stack.pop()
+        for value in container.values() if container.__class__ is dict else container:
+            cls = value.__class__
+            if cls in _SCALARS:
+                continue
+            if cls in _CONTAINERS:
+                stack.append(value)
+            elif cls is float:
+                if value and not 1e-4 <= abs(value) < 1e16:  # Also true for NaN
+                    return True
+            elif dataclasses.is_dataclass(value):
+                stack.append(dataclasses.asdict(value))
+    return False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with orjson."""
+
+    def _orjson_dumps(self, obj, indent):
+        option = _PASSTHROUGH
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            data = orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
+        if self.ensure_ascii and (not data.isascii() or b"\x7f" in data):
+            return None
+        if _has_unsafe_float(obj):
+            return None
+        return data
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        data = self._orjson_dumps(obj, indent)
+        if data is None:
+            return super().response(obj)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Use orjson for JSON responses when it is installed."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
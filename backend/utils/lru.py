@@ -0,0 +1,65 @@
+"""
+Bounded in-process LRU cache with per-entry TTL.
+Used for small, hot lookups (authenticated users, board ACLs) that would
+otherwise cost a database or Redis round trip on every request.
+"""
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import Counters
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.stats = Counters("hits", "misses", "evictions", "expirations", "invalidations")
+
+    def get(self, key):
+        """Return the cached value or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.incr("misses")
+                return None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.stats.incr("expirations")
+                self.stats.incr("misses")
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.incr("hits")
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats.incr("invalidations")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        """Counters plus current size and hit ratio."""
+        values = self.stats.snapshot()
+        lookups = values["hits"] + values["misses"]
+        values["size"] = len(self._entries)
+        values["hit_ratio"] = round(values["hits"] / lookups, 4) if lookups else 0.0
+        return values
@@ -0,0 +1,62 @@
+"""
+In-process metrics registry.
+Subsystems register a provider returning a dict of their counters; the
+metrics route reports all of them in one response.
+"""
+import threading
+
+_providers = {}
+
+
+class Counters:
+    """Thread-safe named counters."""
+
+    def __init__(self, *names):
+        self._lock = threading.Lock()
+        self._values = {name: 0 for name in names}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed bucket upper bounds (cumulative counts)."""
+
+    def __init__(self, bounds):
+        self._lock = threading.Lock()
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)  # last bucket: above every bound
+        self._count = 0
+        self._sum = 0
+
+    def observe(self, value):
+        index = next((i for i, bound in enumerate(self._bounds) if value <= bound), len(self._bounds))
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self):
+        with self._lock:
+            counts, count, total = list(self._counts), self._count, self._sum
+
+        buckets, cumulative = {}, 0
+        for bound, bucket_count in zip(self._bounds + ("inf",), counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound}"] = cumulative
+        return {"count": count, "sum": total, "buckets": buckets}
+
+
+def register_metrics(name, provider):
+    """Register a callable returning a dict of metrics under ``name``."""
+    _providers[name] = provider
+
+
+def collect_metrics():
+    """Collect the current values from every registered provider."""
+    return {name: provider() for name, provider in _providers.items()}
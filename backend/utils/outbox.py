@@ -0,0 +1,75 @@
+"""
+After-commit outbox for board events.
+
+Controllers record WebSocket events on their database session with
+publish_board_event(). The events are handed to a background dispatcher
+only once the session's transaction commits, and are dropped if it rolls
+back, so clients never see changes that did not happen and the HTTP
+response does not wait on Socket.IO fan-out.
+"""
+import os
+import threading
+from sqlalchemy import event
+from database import Session
+from utils.logger import logger
+from utils.metrics import Counters, register_metrics
+from utils.websocket import socketio, emit_to_board
+
+_pending = None  # Queue of the running dispatcher, see _ensure_dispatcher
+_dispatcher_lock = threading.Lock()
+_dispatcher_pid = None
+
+outbox_stats = Counters("published", "dispatched", "failed", "discarded")
+register_metrics("board_events", lambda: {**outbox_stats.snapshot(), "queued": _pending.qsize() if _pending else 0})
+
+
+def publish_board_event(session, board_id, event_name, data):
+    """Queue an event for the board's room, to be emitted after the session commits."""
+    session.info.setdefault("board_events", []).append((board_id, event_name, data))
+
+
+def _dispatch_events(pending):
+    while True:
+        board_id, event_name, data = pending.get()
+        try:
+            emit_to_board(board_id, event_name, data)
+            outbox_stats.incr("dispatched")
+        except Exception as e:
+            outbox_stats.incr("failed")
+            logger.error(f"Failed to emit WebSocket event {event_name}: {e}")
+
+
+def _ensure_dispatcher():
+    """
+    Start the dispatcher in this process (again after a fork) if it is not running.
+
+    The queue comes from the Socket.IO async driver (an eventlet queue under
+    eventlet), so the dispatcher waiting on it yields to the other green
+    threads even when the standard library is not monkey-patched.
+    """
+    global _dispatcher_pid, _pending
+    if _dispatcher_pid == os.getpid():
+        return
+    with _dispatcher_lock:
+        if _dispatcher_pid != os.getpid():
+            _pending = socketio.server.eio.create_queue()
+            socketio.start_background_task(_dispatch_events, _pending)
+            _dispatcher_pid = os.getpid()
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed_events(session):
+    events = session.info.pop("board_events", None)
+    if not events:
+        return
+    _ensure_dispatcher()
+    for board_event in events:
+        _pending.put(board_event)
+    outbox_stats.incr("published", len(events))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_events(session):
+    events = session.info.pop("board_events", None)
+    if events:
+        outbox_stats.incr("discarded", len(events))
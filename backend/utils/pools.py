@@ -0,0 +1,81 @@
+"""
+Connection pool bulkheads and saturation metrics.
+
+Each request's session uses the pool of its route class (database.engines):
+"auth", "heavy" or any other class named with @db_pool on the route, else
+"read" for GET/HEAD and "write" for everything else. Socket.IO events and
+background work use the default "write" pool.
+
+/api/metrics reports, per pool, connections in use and in overflow, the
+requests waiting for one, and a histogram of how long checkouts waited,
+in milliseconds.
+"""
+from flask import current_app, request
+from database import checkout_observers, checkout_waiters, db_session, engines, replica_engines
+from utils.metrics import Counters, Histogram, register_metrics
+from utils.replicas import READ_METHODS
+
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+_wait_histograms = {}
+pool_stats = Counters()
+
+
+def db_pool(name):
+    """Mark a route to use the named connection pool (see Config.DB_POOLS)."""
+    def decorator(view):
+        view.db_pool = name
+        return view
+    return decorator
+
+
+def request_pool_name():
+    """Get the pool (route class) of the current request."""
+    view = current_app.view_functions.get(request.endpoint)
+    name = getattr(view, "db_pool", None)
+    if name is None:
+        name = "read" if request.method in READ_METHODS else "write"
+    return name
+
+
+def init_db_pools(app):
+    """Pick the pool of each request's session from its route."""
+    @app.before_request
+    def select_db_pool():
+        db_session().info["pool"] = request_pool_name()
+
+
+def _observe_checkout(name, seconds, timed_out):
+    histogram = _wait_histograms.get(name)
+    if histogram is None:
+        histogram = _wait_histograms.setdefault(name, Histogram(CHECKOUT_WAIT_BUCKETS_MS))
+    histogram.observe(seconds * 1000)
+    pool_stats.incr(f"{name}_checkouts")
+    if timed_out:
+        pool_stats.incr(f"{name}_timeouts")
+
+
+checkout_observers.append(_observe_checkout)
+
+
+def _pool_metrics():
+    counters = pool_stats.snapshot()
+    all_engines = {**engines, **{engine.pool.logging_name: engine for engine in replica_engines}}
+    metrics = {}
+    for name, engine in all_engines.items():
+        pool = engine.pool
+        histogram = _wait_histograms.get(name)
+        metrics[name] = {
+            "size": pool.size(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "waiting": checkout_waiters.get(name),
+            "checkouts": counters.get(f"{name}_checkouts", 0),
+            "timeouts": counters.get(f"{name}_timeouts", 0),
+            "wait_ms": histogram.snapshot() if histogram else None,
+        }
+    return metrics
+
+
+register_metrics("db_pools", _pool_metrics)
@@ -0,0 +1,18 @@
+"""
+Board presence: who is currently viewing a board.
+Built on the connection registry, so it sees every worker's sockets when
+the registry is shared.
+"""
+import uuid
+from utils.auth import load_principal
+from utils.connections import connections
+
+
+def board_viewers(board_id):
+    """Get the users with at least one socket joined to a board, as [{user_id, name}]."""
+    viewers = []
+    for user_id in sorted(set(connections.board_connections(str(board_id)).values())):
+        principal = load_principal(uuid.UUID(user_id))
+        if principal:
+            viewers.append({'user_id': user_id, 'name': principal.name})
+    return viewers
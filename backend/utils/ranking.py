@@ -0,0 +1,222 @@
+"""
+Fractional (lexorank-style) ordering for cards and lists.
+
+Cards and lists are ordered by a string ``rank`` instead of a dense integer
+position. Ranks are base-62 fractions compared byte-wise (the column uses
+the "C" collation), so a new key can always be generated between two
+neighbours and a move only has to write the row being moved. When keys grow
+too long the siblings are rebalanced onto evenly spaced keys.
+
+The API keeps reporting integer positions; those are derived from rank order
+(see ``position_expression``).
+"""
+from sqlalchemy import bindparam, select, func, update
+from models import Card, List
+
+
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(ALPHABET)
+_DIGITS = {char: index for index, char in enumerate(ALPHABET)}
+
+# Keys longer than this trigger a rebalance of the sibling set
+MAX_RANK_LENGTH = 32
+
+# Appending/prepending steps by one unit at this many digits, so repeated
+# appends do not lengthen keys the way halving the open interval would
+STEP_WIDTH = 4
+
+# Ordering scope of each ranked model: (scope column, primary key column)
+_SCOPES = {
+    Card: (Card.list_id, Card.card_id),
+    List: (List.board_id, List.list_id),
+}
+
+
+# ============================================================================
+# KEY GENERATION
+# ============================================================================
+
+def _digit(key, index):
+    if key is None or index >= len(key):
+        return 0
+    return _DIGITS[key[index]]
+
+
+def _step(key, delta):
+    """Add ``delta`` (+1 or -1) to ``key`` at STEP_WIDTH digits; None on overflow."""
+    width = max(len(key), STEP_WIDTH)
+    digits = [_digit(key, index) for index in range(width)]
+
+    for index in reversed(range(width)):
+        digits[index] += delta
+        if 0 <= digits[index] < BASE:
+            break
+        digits[index] %= BASE
+    else:
+        return None
+
+    stepped = "".join(ALPHABET[d] for d in digits).rstrip("0")
+    return stepped or None
+
+
+def rank_between(before=None, after=None):
+    """
+    Return a rank that sorts strictly between ``before`` and ``after``.
+
+    Either bound may be None to mean the start or the end of the sequence.
+    Generated keys never end in '0' so that no two keys are equal as fractions.
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Invalid rank bounds: {before!r} >= {after!r}")
+
+    if after is None and before is not None:
+        stepped = _step(before, 1)
+        if stepped is not None:
+            return stepped
+    if before is None and after is not None:
+        stepped = _step(after, -1)
+        if stepped is not None:
+            return stepped
+
+    result = []
+    index = 0
+    while True:
+        low = _digit(before, index)
+        high = _digit(after, index) if after is not None else BASE
+
+        if low == high:
+            result.append(ALPHABET[low])
+        else:
+            middle = (low + high) // 2
+            if middle > low:
+                result.append(ALPHABET[middle])
+                return "".join(result)
+            # Adjacent digits: keep the lower one and look past the upper bound
+            result.append(ALPHABET[low])
+            after = None
+        index += 1
+
+
+def spread_ranks(count):
+    """Return ``count`` evenly spaced, increasing ranks."""
+    width = 1
+    while BASE ** width <= count * BASE:
+        width += 1
+
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for index in range(1, count + 1):
+        value = index * step
+        digits = []
+        for _ in range(width):
+            value, remainder = divmod(value, BASE)
+            digits.append(ALPHABET[remainder])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+# ============================================================================
+# DATABASE HELPERS
+# ============================================================================
+
+def position_expression(model):
+    """Window expression yielding the zero-based position of each row in its scope."""
+    scope_column, _ = _SCOPES[model]
+    return func.row_number().over(partition_by=scope_column, order_by=model.rank) - 1
+
+
+def rank_for_position(session, model, scope_id, position, exclude_id=None):
+    """
+    Compute the rank that places a row at ``position`` among its siblings.
+
+    Only the (at most two) neighbouring ranks are read. The sibling set is
+    rebalanced first if those neighbours leave no room for a new key.
+
+    Returns:
+        tuple: (rank, position) - position is clamped to the sibling count
+    """
+    scope_column, pk_column = _SCOPES[model]
+    position = max(position, 0)
+
+    def neighbours():
+        query = select(model.rank).where(scope_column == scope_id)
+        if exclude_id is not None:
+            query = query.where(pk_column != exclude_id)
+        query = query.order_by(model.rank)
+
+        if position == 0:
+            after = session.execute(query.limit(1)).scalar()
+            return None, after, 0
+
+        ranks = session.execute(query.offset(position - 1).limit(2)).scalars().all()
+        if ranks:
+            return ranks[0], ranks[1] if len(ranks) > 1 else None, position
+
+        # Requested position is past the end: append after the last sibling
+        count_query = select(func.count(), func.max(model.rank)).where(scope_column == scope_id)
+        if exclude_id is not None:
+            count_query = count_query.where(pk_column != exclude_id)
+        count, last = session.execute(count_query).one()
+        return last, None, count
+
+    before, after, position = neighbours()
+    if before is not None and after is not None and before >= after:
+        rebalance(session, model, scope_id)
+        before, after, position = neighbours()
+
+    rank = rank_between(before, after)
+    if len(rank) > MAX_RANK_LENGTH:
+        rebalance(session, model, scope_id)
+        before, after, position = neighbours()
+        rank = rank_between(before, after)
+
+    return rank, position
+
+
+def rank_for_append(session, model, scope_id):
+    """
+    Compute the rank that places a new row after all of its siblings.
+
+    Returns:
+        tuple: (rank, position)
+    """
+    scope_column, _ = _SCOPES[model]
+    count, last = session.execute(
+        select(func.count(), func.max(model.rank)).where(scope_column == scope_id)
+    ).one()
+
+    rank = rank_between(last, None)
+    if len(rank) > MAX_RANK_LENGTH:
+        rebalance(session, model, scope_id)
+        last = session.execute(
+            select(func.max(model.rank)).where(scope_column == scope_id)
+        ).scalar()
+        rank = rank_between(last, None)
+
+    return rank, count
+
+
+def rebalance(session, model, scope_id):
+    """
+    Rewrite the ranks of every row in a scope onto evenly spaced keys.
+
+    Runs as a Core executemany on the table, not an ORM bulk update: the
+    order is unchanged, so versioned rows (Card.version) keep their version,
+    and the row being moved still matches the version it was loaded with.
+    """
+    scope_column, pk_column = _SCOPES[model]
+    ids = session.execute(
+        select(pk_column).where(scope_column == scope_id).order_by(model.rank, pk_column)
+    ).scalars().all()
+
+    if not ids:
+        return
+
+    table = model.__table__
+    session.execute(
+        update(table).where(table.c[pk_column.key] == bindparam("_id")).values(rank=bindparam("_rank")),
+        [
+            {"_id": row_id, "_rank": rank}
+            for row_id, rank in zip(ids, spread_ranks(len(ids)))
+        ]
+    )
@@ -0,0 +1,105 @@
+"""
+Read-your-writes routing for read replicas.
+
+GET requests read from a replica (database.RoutingSession) unless the user
+committed a write in the last DB_READ_YOUR_WRITES_WINDOW seconds, in which
+case the request stays on the primary. Board cache fills for recently
+written boards (utils/cache.py) and the principal and ACL caches always
+read from the primary, so replica lag never ends up in a shared cache.
+"""
+import redis
+from sqlalchemy import event
+from config import Config
+from database import Session, replica_engines
+from utils.lru import TTLCache
+from utils.metrics import Counters, register_metrics
+
+READ_METHODS = ("GET", "HEAD")
+
+routing_stats = Counters("replica", "primary", "sticky")
+register_metrics("db_routing", routing_stats.snapshot)
+
+
+class MemoryStickiness:
+    """Recent writers seen by this process (single worker, local dev)."""
+
+    def __init__(self, window):
+        # One entry per user, like the principal cache
+        self._writers = TTLCache(Config.PRINCIPAL_CACHE_SIZE, window)
+
+    def mark(self, user_id):
+        self._writers.set(user_id, True)
+
+    def is_sticky(self, user_id):
+        return self._writers.get(user_id) is not None
+
+
+class RedisStickiness:
+    """Recent writers shared by every worker through Redis."""
+
+    def __init__(self, client, window):
+        self._redis = client
+        self._window_ms = int(window * 1000)
+
+    @staticmethod
+    def _key(user_id):
+        return f"kanban_user_{user_id}_wrote"
+
+    def mark(self, user_id):
+        self._redis.set(self._key(user_id), 1, px=self._window_ms)
+
+    def is_sticky(self, user_id):
+        return bool(self._redis.exists(self._key(user_id)))
+
+
+def create_stickiness():
+    if Config.DB_STICKINESS_STORE == "redis":
+        return RedisStickiness(redis.Redis.from_url(Config.REDIS_URL), Config.DB_READ_YOUR_WRITES_WINDOW)
+    return MemoryStickiness(Config.DB_READ_YOUR_WRITES_WINDOW)
+
+
+stickiness = create_stickiness()
+
+
+def route_session(session, user_id, read_only):
+    """
+    Route the session of a request made by user_id. Reads go to a replica
+    only if the request is read-only and the user has not written recently.
+    Must be called before the session runs its first statement.
+    """
+    if not replica_engines:
+        return
+
+    session.info["user_id"] = user_id
+    if not read_only:
+        routing_stats.incr("primary")
+    elif stickiness.is_sticky(user_id):
+        routing_stats.incr("sticky")
+    else:
+        session.info["use_replica"] = True
+        routing_stats.incr("replica")
+
+
+@event.listens_for(Session, "after_flush")
+def _note_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_statement_write(orm_execute_state):
+    # INSERT/UPDATE/DELETE statements run through the session (such as
+    # insert_if_absent) write without flushing
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_writer(session):
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        stickiness.mark(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write(session):
+    session.info.pop("wrote", None)
@@ -0,0 +1,95 @@
+"""
+Precompiled serializers for the hot board reads.
+
+compile_schema() turns a read-side marshmallow schema into a plain Python
+function that produces exactly what schema.dump() would, without
+marshmallow's per-field accessor and dispatch machinery. The input is
+mappings built from column-tuple queries (get_card_rows and
+get_list_rows_with_cards in utils/helpers.py), so no ORM objects are
+loaded either.
+
+Only the field types the read-side schemas use are supported. Anything
+else raises at import time rather than dumping something different.
+"""
+from marshmallow import fields, missing
+from schemas.card_schema import CardSchema
+from schemas.list_schema import ListWithCardsSchema
+
+
+def _uuid(value):
+    return None if value is None else str(value)
+
+
+def _string(value):
+    if value is None or value.__class__ is str:
+        return value
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
+
+
+def _integer(value):
+    return None if value is None else int(value)
+
+
+def _date(value):
+    return None if value is None else value.isoformat()
+
+
+# Exact field classes only: subclasses (e.g. DateTime of Date) dump differently
+_CONVERTERS = {
+    fields.UUID: _uuid,
+    fields.String: _string,
+    fields.Email: _string,
+    fields.Integer: _integer,
+    fields.Date: _date,
+}
+
+
+def _field_converter(name, field):
+    if field.dump_default is not missing:
+        raise TypeError(f"{name}: dump_default is not supported")
+
+    if isinstance(field, fields.Nested):
+        return compile_schema(field.schema)
+
+    if type(field) is fields.List:
+        inner = _field_converter(name, field.inner)
+        return lambda values: None if values is None else [inner(value) for value in values]
+
+    converter = _CONVERTERS.get(type(field))
+    if converter is None:
+        raise TypeError(f"{name}: {type(field).__name__} is not supported")
+    if type(field) is fields.Date and field.format not in (None, "iso"):
+        raise TypeError(f"{name}: only ISO dates are supported")
+    if type(field) is fields.Integer and field.strict:
+        raise TypeError(f"{name}: strict integers are not supported")
+    return converter
+
+
+def compile_schema(schema):
+    """
+    Compile a schema instance into a function dumping one mapping (or a
+    list of them, for many=True) with the same output as schema.dump().
+    """
+    namespace = {}
+    items = []
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute or name
+        if "." in attribute:
+            raise TypeError(f"{name}: dotted attributes are not supported")
+        namespace[f"_f{index}"] = _field_converter(name, field)
+        items.append(f"{field.data_key or name!r}: _f{index}(obj[{attribute!r}])")
+
+    # One dict display per object: no per-field loop or lookups at dump time
+    source = "def dump(obj):\n    return {" + ", ".join(items) + "}\n"
+    exec(compile(source, f"<serializer {type(schema).__name__}>", "exec"), namespace)
+    dump = namespace["dump"]
+
+    if schema.many:
+        return lambda objs: [dump(obj) for obj in objs]
+    return dump
+
+
+dump_cards = compile_schema(CardSchema(many=True))
+dump_lists_with_cards = compile_schema(ListWithCardsSchema(many=True))
@@ -0,0 +1,114 @@
+"""
+Server-Sent Events streams of board events for read-only subscribers.
+
+A stream carries the same numbered events as the board's Socket.IO room,
+read from the event log (utils/event_log.py), with the seq as the event
+id so a reconnecting client resumes from Last-Event-ID. Events emitted by
+this process wake the board's streams at once; with the Redis event log,
+events emitted by other workers are picked up every SSE_POLL_INTERVAL
+seconds. Idle streams get a comment frame every SSE_HEARTBEAT_INTERVAL
+seconds, when the subscriber's access to the board is checked again.
+"""
+import json
+import threading
+import time
+from config import Config
+from database import Session
+from utils.acl import get_board_acl
+from utils.event_log import event_log
+from utils.metrics import Counters, register_metrics
+
+
+_wakeups = {}  # board_id -> set of the wakeup events of its open streams
+_wakeups_lock = threading.Lock()
+
+stream_stats = Counters("opened", "closed", "events", "heartbeats")
+register_metrics("sse_streams", lambda: {**stream_stats.snapshot(), "boards": len(_wakeups)})
+
+
+def notify_board(board_id):
+    """Wake the board's streams after an event was added to its log."""
+    with _wakeups_lock:
+        wakeups = tuple(_wakeups.get(board_id, ()))
+    for wakeup in wakeups:
+        wakeup.set()
+
+
+def _subscribe(board_id):
+    # Imported here: utils.websocket imports this module
+    from utils.websocket import socketio
+
+    # An event of the async driver, so waiting on it yields to the other
+    # green threads instead of blocking the hub
+    wakeup = socketio.server.eio.create_event()
+    with _wakeups_lock:
+        _wakeups.setdefault(board_id, set()).add(wakeup)
+    return wakeup
+
+
+def _unsubscribe(board_id, wakeup):
+    with _wakeups_lock:
+        wakeups = _wakeups.get(board_id)
+        wakeups.discard(wakeup)
+        if not wakeups:
+            del _wakeups[board_id]
+
+
+def _has_access(board_id, user_id):
+    # Streams outlive their request, so this does not use the request session.
+    # It only connects if the ACL is not cached.
+    session = Session(info={"pool": "read"})
+    try:
+        acl = get_board_acl(session, board_id)
+    finally:
+        session.close()
+    return bool(acl) and acl.has_access(user_id)
+
+
+def _frame(event, data, seq):
+    stream_stats.incr("events")
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def board_event_stream(board_id, user_id, last_seq=None):
+    """
+    Generate the SSE frames for a board, starting after last_seq (or from
+    now). Ends when the subscriber loses access to the board.
+    """
+    wakeup = _subscribe(board_id)
+    stream_stats.incr("opened")
+    poll_interval = Config.SSE_POLL_INTERVAL if Config.BOARD_EVENT_LOG == "redis" else None
+    try:
+        yield f"retry: {Config.SSE_RETRY_MS}\n\n"
+        if last_seq is None:
+            last_seq = event_log.current(board_id)
+
+        last_frame = time.monotonic()
+        while True:
+            # Before reading the log, so an event added meanwhile wakes the wait below
+            wakeup.clear()
+            current, missed = event_log.since(board_id, last_seq)
+            if missed is None:
+                # Gap is larger than the buffer
+                yield _frame('board:resync', {'board_id': board_id, 'seq': current}, current)
+                last_frame = time.monotonic()
+            elif missed:
+                for event, data in missed:
+                    yield _frame(event, data, data['seq'])
+                last_frame = time.monotonic()
+            last_seq = current
+
+            if time.monotonic() - last_frame >= Config.SSE_HEARTBEAT_INTERVAL:
+                if not _has_access(board_id, user_id):
+                    return
+                stream_stats.incr("heartbeats")
+                yield ": heartbeat\n\n"
+                last_frame = time.monotonic()
+
+            timeout = Config.SSE_HEARTBEAT_INTERVAL - (time.monotonic() - last_frame)
+            if poll_interval is not None:
+                timeout = min(timeout, poll_interval)
+            wakeup.wait(max(timeout, 0))
+    finally:
+        _unsubscribe(board_id, wakeup)
+        stream_stats.incr("closed")
@@ -1,48 +1,46 @@
-from flask_socketio import SocketIO, emit, join_room, leave_room
+from flask_socketio import SocketIO, ConnectionRefusedError, emit, join_room, leave_room
 from functools import wraps
-from flask import request
+from flask import request, session as socket_session
 import jwt
 from config import Config
-from models import User, Board, BoardMember
-from database import Session
+from database import db_session
+from utils.auth import load_principal
+from utils.acl import get_board_acl
+from utils.connections import connections
+from utils.event_log import event_log
+from utils.presence import board_viewers
+from utils.sse import notify_board
+from utils.encoding import MSGPACK, board_room, encode_event_data, msgpack_enabled, negotiate_encoding
+from utils.metrics import Counters, register_metrics
+import os
+import threading
+import time
 import uuid
 
 # Create SocketIO instance - will be initialized with app in app.py
 socketio = SocketIO(logger=False, engineio_logger=False)
 
-# Store active connections: {user_id: {socket_id: set_of_board_ids}}
-user_connections = {}
-
 
 def authenticated_only(f):
-    """Decorator to require authentication for socket events"""
+    """Decorator to require a socket authenticated at connect time"""
     @wraps(f)
     def wrapped(*args, **kwargs):
-        token = request.args.get('token')
-        if not token:
+        principal = socket_session.get('principal')
+        if principal is None:
             return {'error': 'Authentication required'}, 401
-        
-        try:
-            data = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
-            user_uuid = uuid.UUID(data["user_id"])
-        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, ValueError):
+
+        expires_at = socket_session.get('expires_at')
+        if expires_at is not None and expires_at <= time.time():
             return {'error': 'Invalid or expired token'}, 401
         
-        session = Session()
-        user = session.query(User).get(user_uuid)
-        session.close()
-        
-        if not user:
-            return {'error': 'User not found'}, 401
-        
-        request.current_user = user
+        request.current_user = principal
         return f(*args, **kwargs)
     
     return wrapped
 
 
 def board_member_only(f):
-    """Decorator to verify user is a member of the board"""
+    """Decorator to verify user is a member of the board (checked against the cached board ACL)"""
     @wraps(f)
     def wrapped(data, *args, **kwargs):
         if not hasattr(request, 'current_user'):
@@ -57,23 +55,13 @@ def board_member_only(f):
         except ValueError:
             return {'error': 'Invalid board_id format'}, 400
         
-        session = Session()
-        board = session.query(Board).filter_by(board_id=board_uuid).first()
+        # The session only connects if the ACL is not cached
+        acl = get_board_acl(db_session(), board_uuid)
         
-        if not board:
-            session.close()
+        if not acl:
             return {'error': 'Board not found'}, 404
         
-        # Check if user is owner or member
-        is_owner = board.owner_id == request.current_user.user_id
-        is_member = session.query(BoardMember).filter_by(
-            board_id=board_uuid,
-            user_id=request.current_user.user_id
-        ).first() is not None
-        
-        session.close()
-        
-        if not (is_owner or is_member):
+        if not acl.has_access(request.current_user.user_id):
             return {'error': 'Access denied'}, 403
         
         return f(data, *args, **kwargs)
@@ -82,8 +70,30 @@ def board_member_only(f):
 
 
 @socketio.on('connect')
-def handle_connect():
-    """Handle client connection"""
+def handle_connect(auth=None):
+    """
+    Authenticate the client once, from the token in the auth payload (or the
+    token query parameter), and keep its principal in the socket session.
+    """
+    token = auth.get('token') if isinstance(auth, dict) else None
+    token = token or request.args.get('token')
+    if not token:
+        raise ConnectionRefusedError('Authentication required')
+
+    try:
+        data = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
+        user_uuid = uuid.UUID(data["user_id"])
+    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, ValueError, KeyError):
+        raise ConnectionRefusedError('Invalid or expired token')
+
+    principal = load_principal(user_uuid)
+    if not principal:
+        raise ConnectionRefusedError('User not found')
+
+    # Flask-SocketIO keeps this session in memory for the life of the connection
+    socket_session['principal'] = principal
+    socket_session['expires_at'] = data.get('exp')
+    socket_session['encoding'] = negotiate_encoding(auth)
     print(f"Client connected: {request.sid}")
 
 
@@ -91,33 +101,50 @@ def handle_connect():
 def handle_disconnect():
     """Handle client disconnection"""
     print(f"Client disconnected: {request.sid}")
-    # Clean up user connections
-    for user_id, connections in list(user_connections.items()):
-        if request.sid in connections:
-            del connections[request.sid]
-            if not connections:
-                del user_connections[user_id]
+    for board_id in connections.disconnect(request.sid):
+        broadcast_presence(board_id)
 
 
 @socketio.on('join_board')
 @authenticated_only
 @board_member_only
 def handle_join_board(data):
-    """Join a board room to receive real-time updates"""
+    """
+    Join a board room to receive real-time updates.
+    Clients rejoining after a disconnect send the last seq they received as
+    last_seq and get the events they missed replayed.
+    """
     board_id = data.get('board_id')
-    room = f"board_{board_id}"
-    join_room(room)
+    last_seq = data.get('last_seq')
+    if last_seq is not None and (not isinstance(last_seq, int) or last_seq < 0):
+        return {'error': 'last_seq must be a non-negative integer'}, 400
+
+    join_room(board_room(board_id, socket_session.get('encoding')))
     
     # Track user connection
     user_id = str(request.current_user.user_id)
-    if user_id not in user_connections:
-        user_connections[user_id] = {}
-    if request.sid not in user_connections[user_id]:
-        user_connections[user_id][request.sid] = set()
-    user_connections[user_id][request.sid].add(board_id)
+    connections.join(request.sid, user_id, board_id)
+    _ensure_connection_heartbeat()
     
     print(f"User {user_id} joined board {board_id}")
-    emit('joined_board', {'board_id': board_id, 'status': 'success'})
+    broadcast_presence(board_id)
+
+    encoding = socket_session.get('encoding')
+    if last_seq is None:
+        emit('joined_board', {
+            'board_id': board_id, 'status': 'success', 'seq': event_log.current(board_id), 'encoding': encoding
+        })
+        return
+
+    # Events emitted between join_room and here may arrive twice; clients drop seqs they have seen
+    current_seq, missed = event_log.since(board_id, last_seq)
+    emit('joined_board', {'board_id': board_id, 'status': 'success', 'seq': current_seq, 'encoding': encoding})
+    if missed is None:
+        # Gap is larger than the buffer
+        _emit_to_socket('board:resync', {'board_id': board_id, 'seq': current_seq})
+    else:
+        for event, event_data in missed:
+            _emit_to_socket(event, event_data)
 
 
 @socketio.on('leave_board')
@@ -125,21 +152,67 @@ def handle_join_board(data):
 def handle_leave_board(data):
     """Leave a board room"""
     board_id = data.get('board_id')
-    room = f"board_{board_id}"
-    leave_room(room)
+    leave_room(board_room(board_id, socket_session.get('encoding')))
     
     # Update user connections
     user_id = str(request.current_user.user_id)
-    if user_id in user_connections and request.sid in user_connections[user_id]:
-        user_connections[user_id][request.sid].discard(board_id)
+    connections.leave(request.sid, board_id)
     
     print(f"User {user_id} left board {board_id}")
     emit('left_board', {'board_id': board_id, 'status': 'success'})
+    broadcast_presence(board_id)
+
+
+_heartbeat_pid = None
+
+
+def _heartbeat_connections():
+    while True:
+        socketio.sleep(Config.CONNECTION_HEARTBEAT_INTERVAL)
+        try:
+            connections.heartbeat()
+        except Exception as e:
+            print(f"Connection heartbeat failed: {e}")
+
+
+def _ensure_connection_heartbeat():
+    """Keep this process's sockets alive in the registry (again after a fork)."""
+    global _heartbeat_pid
+    if _heartbeat_pid != os.getpid():
+        _heartbeat_pid = os.getpid()
+        socketio.start_background_task(_heartbeat_connections)
+
+
+def broadcast_presence(board_id):
+    """Send the board's current viewers to its room. Presence is not numbered or logged."""
+    try:
+        _emit_to_rooms(board_id, 'board:presence', {
+            'board_id': board_id,
+            'viewers': board_viewers(board_id)
+        })
+    except Exception as e:
+        print(f"WebSocket presence emit failed: {e}")
+
+
+def _emit_to_rooms(board_id, event, data, **kwargs):
+    """Send an event to a board's JSON room and, when enabled, its msgpack room (encoded once)."""
+    socketio.emit(event, data, room=board_room(board_id), **kwargs)
+    if msgpack_enabled():
+        socketio.emit(event, encode_event_data(data), room=board_room(board_id, MSGPACK), **kwargs)
+
+
+def _emit_to_socket(event, data):
+    """Send an event to the current socket in the encoding it negotiated."""
+    if socket_session.get('encoding') == MSGPACK:
+        data = encode_event_data(data)
+    emit(event, data)
 
 
 def emit_to_board(board_id, event, data, include_self=True):
     """
-    Emit an event to all users in a board room
+    Emit an event to all users in a board room.
+    The event is numbered and logged for replay; the data sent carries its seq.
+    With BOARD_EVENT_BATCH_WINDOW_MS set, the event is sent in the board's next batch.
     
     Args:
         board_id: UUID of the board
@@ -147,10 +220,89 @@ def emit_to_board(board_id, event, data, include_self=True):
         data: Data to send
         include_self: Whether to include the current request sender (always True for REST API calls)
     """
-    room = f"board_{str(board_id)}"
+    if Config.BOARD_EVENT_BATCH_WINDOW_MS > 0:
+        _add_to_batch(str(board_id), event, data)
+        return
+
     try:
-        socketio.emit(event, data, room=room, include_self=include_self)
+        data = event_log.append(str(board_id), event, data)
+        notify_board(str(board_id))
+        _emit_to_rooms(str(board_id), event, data, include_self=include_self)
     except Exception as e:
         # If emit fails (e.g., no active connections), just log and continue
         # This ensures REST API still works even if WebSocket is down
         print(f"WebSocket emit failed (this is OK if no clients connected): {e}")
+
+
+# ============================================================================
+# EVENT BATCHING
+# ============================================================================
+#
+# The first event for a board opens a batch window; everything emitted for
+# the board until it closes goes out as a single board:batch frame. A later
+# update or move of the same card replaces the earlier one.
+
+# Events where only the latest one per card matters
+COALESCED_EVENTS = {'card:updated', 'card:moved'}
+
+_batches = {}  # board_id -> [(event, data)]
+_batches_lock = threading.Lock()
+batch_stats = Counters("frames", "events", "coalesced")
+register_metrics("board_event_batches", batch_stats.snapshot)
+
+
+def _card_id(data):
+    # Full events carry the card, delta events (utils/deltas.py) its id
+    return data['card']['card_id'] if 'card' in data else data['card_id']
+
+
+def _coalesce(pending, event, data):
+    """Add an event to a pending batch, dropping the one it supersedes."""
+    if event in COALESCED_EVENTS:
+        card_id = _card_id(data)
+        for i, (queued_event, queued_data) in enumerate(pending):
+            if queued_event == event and _card_id(queued_data) == card_id:
+                # Keep where the card started so clients refresh that list too
+                if 'old_list_id' in queued_data:
+                    data = {**data, 'old_list_id': queued_data['old_list_id']}
+                # Deltas accumulate; a full card already has every field
+                if 'patch' in data:
+                    data = {**data, 'patch': {**queued_data['patch'], **data['patch']}}
+                del pending[i]
+                batch_stats.incr("coalesced")
+                break
+    pending.append((event, data))
+
+
+def _add_to_batch(board_id, event, data):
+    with _batches_lock:
+        pending = _batches.get(board_id)
+        opens_window = pending is None
+        if opens_window:
+            pending = _batches[board_id] = []
+        _coalesce(pending, event, data)
+
+    if opens_window:
+        socketio.start_background_task(_send_batch, board_id)
+
+
+def _send_batch(board_id):
+    socketio.sleep(Config.BOARD_EVENT_BATCH_WINDOW_MS / 1000)
+    with _batches_lock:
+        pending = _batches.pop(board_id, [])
+    if not pending:
+        return
+
+    try:
+        events = [(event, event_log.append(board_id, event, data)) for event, data in pending]
+        notify_board(board_id)
+        if len(events) == 1:
+            _emit_to_rooms(board_id, events[0][0], events[0][1])
+        else:
+            _emit_to_rooms(board_id, 'board:batch', {
+                'events': [{'event': event, 'data': data} for event, data in events]
+            })
+        batch_stats.incr("frames")
+        batch_stats.incr("events", len(events))
+    except Exception as e:
+        print(f"WebSocket batch emit failed: {e}")
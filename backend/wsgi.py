@@ -5,6 +5,7 @@ app = create_app()
 
 # For production deployment with gunicorn + eventlet/gevent
 # Use: gunicorn --worker-class eventlet -w 1 --bind 0.0.0.0:5000 wsgi:app
+# More workers need SOCKETIO_MESSAGE_QUEUE and CONNECTION_REGISTRY=redis (see config.py)
 # Or with socketio: gunicorn --worker-class gevent -w 1 --bind 0.0.0.0:5000 wsgi:app
 
 
@@ -35,9 +35,11 @@ const Board: React.FC = () => {
       queryClient.invalidateQueries({ queryKey: ["cards", data.list_id] });
     });
 
+    // Full events carry data.card, delta events only data.list_id and a patch
     const unsubCardUpdated = ws.on("card:updated", (data: any) => {
-      queryClient.invalidateQueries({ queryKey: ["cards", data.card.list_id] });
-      if (data.old_list_id && data.old_list_id !== data.card.list_id) {
+      const listId = data.card?.list_id ?? data.list_id;
+      queryClient.invalidateQueries({ queryKey: ["cards", listId] });
+      if (data.old_list_id && data.old_list_id !== listId) {
         queryClient.invalidateQueries({
           queryKey: ["cards", data.old_list_id],
         });
@@ -103,6 +105,14 @@ const Board: React.FC = () => {
     });
 
     // Board events
+    // Missed more events than the server buffers: refetch everything
+    const unsubResync = ws.on("board:resync", () => {
+      queryClient.invalidateQueries({ queryKey: ["lists", boardId] });
+      queryClient.invalidateQueries({ queryKey: ["cards"] });
+      queryClient.invalidateQueries({ queryKey: ["boardMembers", boardId] });
+      queryClient.invalidateQueries({ queryKey: ["labels", boardId] });
+    });
+
     const unsubBoardUpdated = ws.on("board:updated", () => {
       queryClient.invalidateQueries({ queryKey: ["boards"] });
     });
@@ -142,6 +152,7 @@ const Board: React.FC = () => {
       unsubListUpdated();
       unsubListDeleted();
       unsubListMoved();
+      unsubResync();
       unsubBoardUpdated();
       unsubMemberAdded();
       unsubMemberRemoved();
@@ -1,4 +1,5 @@
 import api from "./api";
+import websocketService from "./websocketService";
 import type {
   Card,
   CreateCardPayload,
@@ -29,6 +30,14 @@ export const updateCard = async (
   cardId: string,
   payload: UpdateCardPayload
 ): Promise<Card> => {
+  if (websocketService.isConnected()) {
+    const body = await websocketService.request<CardResponse>("card:update", {
+      card_id: cardId,
+      ...payload,
+    });
+    return body.data;
+  }
+
   const response = await api.put<CardResponse>(`/cards/${cardId}`, payload);
   return response.data.data;
 };
@@ -41,6 +50,15 @@ export const moveCard = async (
   cardId: string,
   payload: { new_list_id: string; new_position: number }
 ): Promise<Card> => {
+  // Same operation over the open socket, without a new HTTP request
+  if (websocketService.isConnected()) {
+    const body = await websocketService.request<CardResponse>("card:move", {
+      card_id: cardId,
+      ...payload,
+    });
+    return body.data;
+  }
+
   const response = await api.put<CardResponse>(
     `/cards/${cardId}/move`,
     payload
@@ -1,4 +1,5 @@
 import api from "./api";
+import websocketService from "./websocketService";
 import type {
   List,
   CreateListPayload,
@@ -39,6 +40,15 @@ export const moveList = async (
   listId: string,
   payload: { new_position: number }
 ): Promise<List> => {
+  // Same operation over the open socket, without a new HTTP request
+  if (websocketService.isConnected()) {
+    const body = await websocketService.request<ListResponse>("list:move", {
+      list_id: listId,
+      ...payload,
+    });
+    return body.data;
+  }
+
   const response = await api.put<ListResponse>(
     `/lists/${listId}/move`,
     payload
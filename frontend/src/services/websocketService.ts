@@ -4,6 +4,8 @@ import { VITE_WS_URL } from "./config";
 class WebSocketService {
   private socket: Socket | null = null;
   private currentBoardId: string | null = null;
+  // Last event seq received per board, sent as last_seq when rejoining
+  private lastSeq: Map<string, number> = new Map();
   private eventHandlers: Map<string, Set<Function>> = new Map();
 
   connect(token: string) {
@@ -67,6 +69,7 @@ class WebSocketService {
       "list:deleted",
       "list:moved",
       // Board events
+      "board:resync",
       "board:updated",
       "board:member_added",
       "board:member_removed",
@@ -81,9 +84,33 @@ class WebSocketService {
         this.handleEvent(event, data);
       });
     });
+
+    // Events coalesced by the server into one frame
+    this.socket.on("board:batch", (data) => {
+      data?.events?.forEach(({ event, data }: { event: string; data: any }) => {
+        this.handleEvent(event, data);
+      });
+    });
+
+    this.socket.on("joined_board", (data) => {
+      if (data?.board_id && !this.lastSeq.has(data.board_id)) {
+        this.lastSeq.set(data.board_id, data.seq ?? 0);
+      }
+    });
   }
 
   private handleEvent(event: string, data: any) {
+    const boardId = this.currentBoardId;
+    if (boardId && typeof data?.seq === "number") {
+      if (event === "board:resync") {
+        this.lastSeq.set(boardId, data.seq);
+      } else {
+        // Replayed events can overlap with live ones
+        if (data.seq <= (this.lastSeq.get(boardId) ?? 0)) return;
+        this.lastSeq.set(boardId, data.seq);
+      }
+    }
+
     const handlers = this.eventHandlers.get(event);
     if (handlers) {
       handlers.forEach((handler) => {
@@ -122,7 +149,13 @@ class WebSocketService {
     }
 
     this.currentBoardId = boardId;
-    this.socket.emit("join_board", { board_id: boardId });
+    const lastSeq = this.lastSeq.get(boardId);
+    this.socket.emit(
+      "join_board",
+      lastSeq === undefined
+        ? { board_id: boardId }
+        : { board_id: boardId, last_seq: lastSeq }
+    );
   }
 
   leaveBoard(boardId: string) {
@@ -133,14 +166,41 @@ class WebSocketService {
     if (this.currentBoardId === boardId) {
       this.currentBoardId = null;
     }
+    this.lastSeq.delete(boardId);
     this.socket.emit("leave_board", { board_id: boardId });
   }
 
+  /**
+   * Send a mutation over the socket (card:move, card:update, list:move).
+   * Resolves with the body the server acks, like the matching REST call.
+   */
+  request<T>(event: string, data: Record<string, unknown>): Promise<T> {
+    return new Promise((resolve, reject) => {
+      if (!this.socket?.connected) {
+        reject(new Error("Socket not connected"));
+        return;
+      }
+
+      this.socket
+        .timeout(10000)
+        .emit(event, data, (err: Error | null, body: T, status: number) => {
+          if (err) {
+            reject(err);
+          } else if (status >= 400) {
+            reject(Object.assign(new Error(`${event} failed`), { status, body }));
+          } else {
+            resolve(body);
+          }
+        });
+    });
+  }
+
   disconnect() {
     if (this.socket) {
       this.socket.disconnect();
       this.socket = null;
       this.currentBoardId = null;
+      this.lastSeq.clear();
       this.eventHandlers.clear();
     }
   }